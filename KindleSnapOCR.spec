@@ -19,10 +19,8 @@ a = Analysis(
         'PIL.ImageTk',
         'pytesseract',
         'fitz',
-        'pyautogui',
-        'pygetwindow',
-        'pyscreeze',
-        'mouseinfo',
+        'mss',
+        'keyboard',
     ],
     hookspath=[],
     hooksconfig={},
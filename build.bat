@@ -23,8 +23,8 @@ pyinstaller --noconfirm --onedir --windowed ^
     --hidden-import "PIL.ImageTk" ^
     --hidden-import "winocr" ^
     --hidden-import "fitz" ^
-    --hidden-import "pyautogui" ^
-    --hidden-import "pygetwindow" ^
+    --hidden-import "mss" ^
+    --hidden-import "keyboard" ^
     main.py
 
 echo.
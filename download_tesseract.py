@@ -7,20 +7,60 @@ import zipfile
 import urllib.request
 import shutil
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# TLS接続を使い回すための共有プール（urllib3が無ければ都度接続にフォールバック）
+try:
+    import urllib3
+    _http = urllib3.PoolManager(num_pools=2, maxsize=4)
+except ImportError:
+    _http = None
 
 
 def download_file(url, dest_path, desc="ダウンロード中"):
     """ファイルをダウンロード（プログレス表示付き）"""
-    def progress_hook(block_num, block_size, total_size):
-        downloaded = block_num * block_size
+    last_percent = -1
+
+    def show_progress(downloaded, total_size):
+        nonlocal last_percent
         if total_size > 0:
             percent = min(100, downloaded * 100 // total_size)
-            bar_len = 30
-            filled = int(bar_len * percent // 100)
-            bar = '=' * filled + '-' * (bar_len - filled)
-            print(f'\r{desc}: [{bar}] {percent}%', end='', flush=True)
-
-    urllib.request.urlretrieve(url, dest_path, progress_hook)
+            if percent != last_percent:
+                last_percent = percent
+                bar_len = 30
+                filled = bar_len * percent // 100
+                bar = '=' * filled + '-' * (bar_len - filled)
+                print(f'\r{desc}: [{bar}] {percent}%', end='', flush=True)
+
+    # urlretrieveの8KiB読みではコールバックが1万回単位で走るため
+    # 1MiBずつストリーミングし、表示は1%刻みに間引く
+    if _http is not None:
+        resp = _http.request('GET', url, preload_content=False)
+        try:
+            # 4xx/5xxのエラーページ本文をtraineddata等として書き込まない
+            # よう、ストリーミング前に失敗させる（urlretrieveと同等の挙動）
+            if resp.status >= 400:
+                raise OSError(f'HTTP {resp.status}: {url}')
+            total_size = int(resp.headers.get('Content-Length') or 0)
+            downloaded = 0
+            with open(dest_path, 'wb') as f:
+                for chunk in resp.stream(1024 * 1024):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    show_progress(downloaded, total_size)
+        finally:
+            resp.release_conn()
+    else:
+        with urllib.request.urlopen(url) as resp, open(dest_path, 'wb') as f:
+            total_size = int(resp.headers.get('Content-Length') or 0)
+            downloaded = 0
+            while True:
+                chunk = resp.read(1024 * 1024)
+                if not chunk:
+                    break
+                f.write(chunk)
+                downloaded += len(chunk)
+                show_progress(downloaded, total_size)
     print()
 
 
@@ -127,12 +167,17 @@ def setup_portable():
         "jpn_vert.traineddata": "https://github.com/tesseract-ocr/tessdata_fast/raw/main/jpn_vert.traineddata",
     }
 
-    for filename, url in tessdata_urls.items():
+    def fetch(item):
+        filename, url = item
         dest = tessdata_dir / filename
         if not dest.exists():
             print(f"ダウンロード中: {filename}")
             download_file(url, str(dest), filename)
 
+    # 3ファイルを並行ダウンロード（直列だとTLSハンドシェイク分だけ待ちが積む）
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(fetch, tessdata_urls.items()))
+
 
 if __name__ == "__main__":
     main()
@@ -26,4 +26,8 @@ def main():
 
 
 if __name__ == '__main__':
+    # ProcessPoolExecutor（大部PDFのテキスト抽出）がspawnする子プロセスが
+    # PyInstaller版exeでmain()を再実行しないようにする
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -4,23 +4,95 @@
 """
 import time
 import os
-from PIL import ImageGrab, Image
-import pyautogui
-import hashlib
+import threading
+import ctypes
+from ctypes import wintypes
+from PIL import Image
+import mss
+import numpy as np
 from typing import Tuple, Optional, Callable
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import keyboard
 
 
+# Windows API（SendInputはpyautoguiの多段処理と違い1システムコールで済む）
+user32 = ctypes.windll.user32
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+VK_LEFT = 0x25
+VK_RIGHT = 0x27
+
+# dHash同士をこのハミング距離以内なら同一ページとみなす
+HAMMING_THRESHOLD = 5
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ('wVk', wintypes.WORD),
+        ('wScan', wintypes.WORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', wintypes.LONG),
+        ('dy', wintypes.LONG),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [('ki', KEYBDINPUT), ('mi', MOUSEINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [('type', wintypes.DWORD), ('union', _INPUTUNION)]
+
+
+def _make_key_inputs(vk: int):
+    """キー押下+離しのINPUT配列を構築"""
+    down = INPUT(type=INPUT_KEYBOARD)
+    down.union.ki = KEYBDINPUT(wVk=vk)
+    up = INPUT(type=INPUT_KEYBOARD)
+    up.union.ki = KEYBDINPUT(wVk=vk, dwFlags=KEYEVENTF_KEYUP)
+    return (INPUT * 2)(down, up)
+
+
+def _make_click_inputs():
+    """左クリック（押下+離し）のINPUT配列を構築"""
+    down = INPUT(type=INPUT_MOUSE)
+    down.union.mi = MOUSEINPUT(dwFlags=MOUSEEVENTF_LEFTDOWN)
+    up = INPUT(type=INPUT_MOUSE)
+    up.union.mi = MOUSEINPUT(dwFlags=MOUSEEVENTF_LEFTUP)
+    return (INPUT * 2)(down, up)
+
+
 class ScreenCapture:
     """画面キャプチャとページ送りを管理"""
 
+    # keep_in_memory時に保持するデコード済みページ数の上限。
+    # フルスクリーン1ページ≒6MBなので、この件数（≒1.2GB）を超える
+    # 大部の書籍はメモリ経路を諦めてファイル経路のOCRに任せる
+    MEMORY_KEEP_MAX = 200
+
     def __init__(
         self,
         region: Tuple[int, int, int, int],
         page_direction: str = 'right',
         delay: float = 0.5,
-        max_duplicates: int = 10
+        max_duplicates: int = 10,
+        hamming_threshold: int = HAMMING_THRESHOLD
     ):
         """
         Args:
@@ -28,6 +100,7 @@ class ScreenCapture:
             page_direction: ページ送り方向 'left' or 'right'
             delay: ページ送り後の待機時間（秒）
             max_duplicates: 自動検出モードでの終了判定回数
+            hamming_threshold: 同一ページ判定のハミング距離上限
         """
         self.region = region
         self.page_direction = page_direction
@@ -36,31 +109,104 @@ class ScreenCapture:
         self.last_hash = None
         self.duplicate_count = 0
         self.max_duplicates = max_duplicates
+        self.hamming_threshold = hamming_threshold
         self.page_count = 0
         self.manual_mode = False  # 手動停止モード
         self.on_end_detected = None  # 終了検出時のコールバック
+        # PNG保存用バックグラウンドスレッド（エンコードでキャプチャを止めない）
+        self._save_pool = ThreadPoolExecutor(max_workers=2)
+        # ESC検出（ポーリングせずフックで即時通知。close()で解除する）
+        self._esc_event = threading.Event()
+        self._esc_hook = keyboard.on_press_key('esc', lambda _e: self._esc_event.set())
+        # mssはDCとバッファを使い回すためImageGrabより高速
+        self._sct = mss.mss()
+        self._monitor = {
+            'left': region[0],
+            'top': region[1],
+            'width': region[2] - region[0],
+            'height': region[3] - region[1],
+        }
+        self._frame = None  # 直近キャプチャのBGRAバッファ（ハッシュ用ビュー）
+        # キャプチャ領域の中央（クリック用、毎ページ再計算しない）
+        self._center_x = (region[0] + region[2]) // 2
+        self._center_y = (region[1] + region[3]) // 2
+        # SendInput用のINPUT構造体を構築しておき毎ページ使い回す
+        page_key = VK_LEFT if page_direction == 'left' else VK_RIGHT
+        self._key_inputs = _make_key_inputs(page_key)
+        self._click_inputs = _make_click_inputs()
+        # ページ描画の安定を検出したら待機を切り上げる（プライバシーモードでは無効）
+        self._adaptive_wait = True
+
+    def close(self):
+        """保存プール・ESCフック・mssハンドルを解放する
+
+        Startの度に新しいインスタンスが作られるため、呼ばないと
+        実行毎にアイドルスレッド2本・システム全体のキーボードフック・
+        GDIのDCが積み上がる。呼んだ後のインスタンスは再利用できない。
+        """
+        self._save_pool.shutdown(wait=True)
+        try:
+            keyboard.unhook(self._esc_hook)
+        except (KeyError, ValueError):
+            pass  # 既に解除済み
+        try:
+            self._sct.close()
+        except Exception:
+            pass
 
     def capture_screen(self) -> Image.Image:
         """指定領域のスクリーンショットを撮影"""
-        screenshot = ImageGrab.grab(bbox=self.region)
-        return screenshot
-
-    def _get_image_hash(self, image: Image.Image) -> str:
-        """画像のハッシュ値を計算（重複検出用）"""
-        # 小さくリサイズしてハッシュ計算（高速化）
-        small = image.resize((32, 32)).convert('L')
-        pixels = list(small.getdata())
-        return hashlib.md5(bytes(pixels)).hexdigest()
-
-    def is_duplicate(self, image: Image.Image, threshold: float = 0.95) -> bool:
-        """前のページと同じかどうかを判定"""
+        raw = self._sct.grab(self._monitor)
+        buf = raw.bgra
+        self._frame = np.frombuffer(buf, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+        return Image.frombytes('RGB', raw.size, buf, 'raw', 'BGRX')
+
+    def _wait_saves(self, save_futures: list):
+        """バックグラウンド保存の完了を待ち、例外があればここで顕在化させる
+
+        プールはshutdownしない（していた頃は2回目のcapture_*呼び出しが
+        「cannot schedule new futures after shutdown」で落ちた）。
+        全submitはsave_futuresに積まれているため、result()を並べて
+        待てば完了保証としては等価。
+        """
+        for future in save_futures:
+            future.result()
+
+    def _get_image_hash(self, image: Image.Image) -> int:
+        """画像のdHash（差分ハッシュ）を計算（重複検出用）"""
+        # キャプチャ直後はBGRAバッファから緑チャンネルをストライド抽出
+        # （フル解像度のresize+convertを省略、読むのは72画素のみ）
+        frame = self._frame
+        if frame is not None:
+            small = frame[::max(1, frame.shape[0] // 8),
+                          ::max(1, frame.shape[1] // 9), 1][:8, :9]
+        else:
+            # resize+convertの2パスではなく整数箱縮小1パス→縮小後にL変換
+            factor = max(1, min(image.width // 9, image.height // 8))
+            small = np.asarray(image.reduce(factor).convert('L'), dtype=np.uint8)
+            small = small[::max(1, small.shape[0] // 8),
+                          ::max(1, small.shape[1] // 9)][:8, :9]
+        # 横方向の輝度勾配を64bitにパック
+        diff = small[:, 1:] > small[:, :-1]
+        return int.from_bytes(np.packbits(diff).tobytes(), 'big')
+
+    @staticmethod
+    def _hamming(a: int, b: int) -> int:
+        """64bitハッシュ間のハミング距離"""
+        return bin(a ^ b).count('1')
+
+    def is_duplicate(self, image: Image.Image, threshold: Optional[int] = None) -> bool:
+        """前のページと同じかどうかを判定（ハミング距離で比較）"""
+        if threshold is None:
+            threshold = self.hamming_threshold
         current_hash = self._get_image_hash(image)
 
         if self.last_hash is None:
             self.last_hash = current_hash
             return False
 
-        is_same = current_hash == self.last_hash
+        # 微小な描画差（アンチエイリアス等）は同一ページとみなす
+        is_same = self._hamming(current_hash, self.last_hash) <= threshold
         self.last_hash = current_hash
 
         if is_same:
@@ -70,29 +216,34 @@ class ScreenCapture:
 
         return is_same
 
+    def _click_center(self):
+        """キャプチャ領域の中央をクリックしてフォーカスを確保"""
+        user32.SetCursorPos(self._center_x, self._center_y)
+        user32.SendInput(2, self._click_inputs, ctypes.sizeof(INPUT))
+
     def turn_page(self):
         """ページを送る"""
-        # キャプチャ領域の中央をクリックしてフォーカスを確保
-        center_x = (self.region[0] + self.region[2]) // 2
-        center_y = (self.region[1] + self.region[3]) // 2
-        pyautogui.click(center_x, center_y)
-        time.sleep(0.1)
-
-        if self.page_direction == 'left':
-            pyautogui.press('left')
-        else:
-            pyautogui.press('right')
-
-        # 待機中もESCをチェック
-        wait_time = self.delay
-        check_interval = 0.05
-        elapsed = 0
-        while elapsed < wait_time:
-            if keyboard.is_pressed('escape'):
+        # SendInputは入力キューに対して同期のため、クリック後の待機は不要
+        self._click_center()
+        user32.SendInput(2, self._key_inputs, ctypes.sizeof(INPUT))
+
+        if not self._adaptive_wait or self.last_hash is None:
+            # 画面を監視できない場合は固定待機（ESCが押されたら即時に抜ける）
+            return self._esc_event.wait(self.delay)  # True = ESC pressed
+
+        # 適応待機：ページが切り替わり描画が安定したら早めに切り上げる
+        deadline = time.monotonic() + self.delay
+        prev_hash = None
+        while time.monotonic() < deadline:
+            if self._esc_event.wait(0.03):
                 return True  # ESC pressed
-            time.sleep(check_interval)
-            elapsed += check_interval
-        return False  # Normal
+            current = self._get_image_hash(self.capture_screen())
+            if (prev_hash is not None
+                    and self._hamming(current, self.last_hash) > self.hamming_threshold
+                    and self._hamming(current, prev_hash) <= self.hamming_threshold):
+                break
+            prev_hash = current
+        return self._esc_event.is_set()
 
     def capture_all_pages(
         self,
@@ -101,7 +252,8 @@ class ScreenCapture:
         progress_callback: Optional[Callable[[int, int], None]] = None,
         check_stop: Optional[Callable[[], bool]] = None,
         on_before_capture: Optional[Callable[[], None]] = None,
-        on_after_capture: Optional[Callable[[], None]] = None
+        on_after_capture: Optional[Callable[[], None]] = None,
+        keep_in_memory: bool = False
     ) -> list:
         """
         全ページをキャプチャする
@@ -113,13 +265,20 @@ class ScreenCapture:
             check_stop: 停止チェックコールバック
             on_before_capture: キャプチャ前コールバック（プライバシーモード用）
             on_after_capture: キャプチャ後コールバック（プライバシーモード用）
+            keep_in_memory: True=画像をcaptured_imagesにも保持（OCRでの再読込を省略）
 
         Returns:
             キャプチャした画像ファイルパスのリスト
         """
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         captured_files = []
+        save_futures = []
         page_num = 1
+        prefix = os.path.join(output_dir, 'page_')
+        self.captured_images = []
+        # オーバーレイで画面が隠れる場合は描画監視による適応待機を使わない
+        self._adaptive_wait = on_before_capture is None
+        self._esc_event.clear()
 
         # 最初のページをキャプチャ
         time.sleep(0.3)  # ウィンドウフォーカス待ち
@@ -150,11 +309,17 @@ class ScreenCapture:
                     break
                 continue
 
-            # 画像保存
-            filename = f"page_{page_num:04d}.png"
-            filepath = os.path.join(output_dir, filename)
-            image.save(filepath, 'PNG')
+            # 画像保存（バックグラウンドで実行し、すぐ次のページへ）
+            filepath = f"{prefix}{page_num:04d}.png"
+            save_futures.append(self._save_pool.submit(image.save, filepath, 'PNG', compress_level=1, optimize=False))
             captured_files.append(filepath)
+            if keep_in_memory:
+                if len(self.captured_images) < self.MEMORY_KEEP_MAX:
+                    self.captured_images.append(image)
+                else:
+                    # 上限超過：溜めた分ごと手放し、OCRはファイル経路に任せる
+                    self.captured_images = []
+                    keep_in_memory = False
 
             # 進捗通知
             if progress_callback:
@@ -166,6 +331,7 @@ class ScreenCapture:
             page_num += 1
             self.duplicate_count = 0
 
+        self._wait_saves(save_futures)
         return captured_files
 
     def capture_until_end(
@@ -177,7 +343,8 @@ class ScreenCapture:
         manual_mode: bool = False,
         on_end_detected: Optional[Callable[[], None]] = None,
         on_before_capture: Optional[Callable[[], None]] = None,
-        on_after_capture: Optional[Callable[[], None]] = None
+        on_after_capture: Optional[Callable[[], None]] = None,
+        keep_in_memory: bool = False
     ) -> list:
         """
         最終ページまで自動でキャプチャする（ページ数不明の場合）
@@ -191,19 +358,24 @@ class ScreenCapture:
             on_end_detected: 終了検出時のコールバック（音・通知用）
             on_before_capture: キャプチャ前コールバック（プライバシーモード用）
             on_after_capture: キャプチャ後コールバック（プライバシーモード用）
+            keep_in_memory: True=画像をcaptured_imagesにも保持（OCRでの再読込を省略）
 
         Returns:
             キャプチャした画像ファイルパスのリスト
         """
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         captured_files = []
+        save_futures = []
         page_num = 1
         end_notified = False
+        prefix = os.path.join(output_dir, 'page_')
+        self.captured_images = []
+        # オーバーレイで画面が隠れる場合は描画監視による適応待機を使わない
+        self._adaptive_wait = on_before_capture is None
+        self._esc_event.clear()
 
         # 最初にKindleウィンドウにフォーカスを当てる
-        center_x = (self.region[0] + self.region[2]) // 2
-        center_y = (self.region[1] + self.region[3]) // 2
-        pyautogui.click(center_x, center_y)
+        self._click_center()
         time.sleep(0.5)
 
         while page_num <= max_pages:
@@ -220,8 +392,10 @@ class ScreenCapture:
             if on_after_capture:
                 on_after_capture()
 
-            # 最初の3ページは重複検出をスキップ
-            if page_num > 3 and self.is_duplicate(image):
+            # 最初の3ページはウォームアップ：重複判定せずハッシュ追跡のみ
+            if page_num <= 3:
+                self.last_hash = self._get_image_hash(image)
+            elif self.is_duplicate(image):
                 if self.duplicate_count >= self.max_duplicates:
                     if manual_mode:
                         # 手動モード：通知のみ、停止しない
@@ -242,10 +416,16 @@ class ScreenCapture:
             # 通知フラグをリセット（ページが変わったので）
             end_notified = False
 
-            filename = f"page_{page_num:04d}.png"
-            filepath = os.path.join(output_dir, filename)
-            image.save(filepath, 'PNG')
+            filepath = f"{prefix}{page_num:04d}.png"
+            save_futures.append(self._save_pool.submit(image.save, filepath, 'PNG', compress_level=1, optimize=False))
             captured_files.append(filepath)
+            if keep_in_memory:
+                if len(self.captured_images) < self.MEMORY_KEEP_MAX:
+                    self.captured_images.append(image)
+                else:
+                    # 上限超過：溜めた分ごと手放し、OCRはファイル経路に任せる
+                    self.captured_images = []
+                    keep_in_memory = False
 
             if progress_callback:
                 progress_callback(page_num, f"{page_num}ページ目をキャプチャ")
@@ -255,9 +435,7 @@ class ScreenCapture:
             page_num += 1
             self.duplicate_count = 0
 
-            # ハッシュを更新
-            self.last_hash = self._get_image_hash(image)
-
+        self._wait_saves(save_futures)
         return captured_files
 
 
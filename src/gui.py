@@ -4,9 +4,16 @@ GUIモジュール
 """
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+from tkinter import font as tkfont
 import threading
+import atexit
+import concurrent.futures
 import os
+import re
 import sys
+import time
+import subprocess
+import collections
 from pathlib import Path
 from datetime import datetime
 
@@ -17,10 +24,77 @@ try:
 except:
     pass
 
+# 関数内importの再解決コストを避けるため、兄弟モジュールは起動時にまとめて読む
+from .capture import ScreenCapture
+from .pdf_generator import PDFGenerator
+from .privacy_overlay import PrivacyOverlayController
+from .region_selector import RegionSelectorWithPreview
+from .ocr_processor import (
+    OCRProcessor, OCREngine, TextDirection, PreprocessingLevel,
+    find_tesseract, check_manga_ocr_available, check_paddleocr_available,
+)
+from .text_extractor import TextExtractor, check_docx_available
+from .tesseract_installer import is_tesseract_installed, download_and_install_tesseract
+
+try:
+    import winsound
+except ImportError:  # Windows以外ではビープ通知なし
+    winsound = None
+
+# ファイル名に使えない文字（\wは日本語タイトルの全角文字もカバーする）
+_UNSAFE_TITLE_RE = re.compile(r'[^\w \-.]+')
+
+# 既定の出力先（expanduserはWindowsではレジストリ参照を伴うため一度だけ）
+_DEFAULT_OUT = str(Path(os.path.expanduser('~')) / 'Documents' / 'KindleSnapOCR')
+
+# ワーカー処理用の共有スレッドプール（実行の度にスレッドを作らない）。
+# 短時間のチェック処理と、停止フラグを見るキャプチャ専用
+_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='ksocr')
+atexit.register(_EXEC.shutdown, wait=False)
+
+
+def _run_detached(fn):
+    """長時間ワーカーをデーモンスレッドで実行する
+
+    _EXECのスレッドは非デーモンで、実行中にウィンドウを閉じると
+    concurrent.futuresの終了フックが完了まで待ってしまう。OCR・抽出・
+    インストールは数分かかるうえ停止フラグも見ないため、ウィンドウと
+    運命を共にするデーモンスレッドに載せる。
+    """
+    threading.Thread(target=fn, daemon=True).start()
+
+
+def _pip_install(package, timeout=600):
+    """pipでパッケージをインストールし (returncode, 出力) を返す
+
+    同一プロセスでpip._internalを呼べばインタプリタの立ち上げ直しと
+    pip自体の再importを払わずに済む。旧pipではサブプロセスにフォールバック。
+    """
+    try:
+        from pip._internal.cli.main import main as pip_main
+    except ImportError:
+        result = subprocess.run(
+            [sys.executable, '-m', 'pip', 'install', package],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        return result.returncode, result.stderr or result.stdout
+
+    import io
+    import contextlib
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+        returncode = pip_main(['install', '--no-input', '--disable-pip-version-check', package])
+    return returncode, buf.getvalue()
+
 
 class MainWindow:
     """メインウィンドウ"""
 
+    # ログ表示の最大行数（Textウィジェットを無制限に肥大化させない）
+    MAX_LOG_LINES = 500
+
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("KindleSnapOCR - Kindle本PDF化ツール")
@@ -30,7 +104,7 @@ class MainWindow:
         # 状態変数
         self.capture_region = None
         self.is_capturing = False
-        self.stop_flag = False
+        self._stop_event = threading.Event()
         self.captured_files = []
 
         # 設定
@@ -46,17 +120,57 @@ class MainWindow:
         self.privacy_mode = tk.BooleanVar(value=False)
         self.privacy_controller = None
 
+        # ワーカースレッドからのログ/ステータスは都度after(0)せずキューに溜め、
+        # 50ms周期のポンプでまとめてTkに反映する
+        self._log_queue = collections.deque()
+        self._status_latest = [None]
+        self._pbar_pct = [None]  # 総数が分かる処理の進捗率（0-100）
+        self._pbar_var = tk.DoubleVar(value=0)
+        self._pump_id = None
+        self._capture_future = None
+        self._log_time_cache = (-1, '')
+        # キャプチャ外のワーカー（抽出/OCR/インストール）の進捗ラベル更新は
+        # widget毎に最新値だけ保持し、100ms周期でまとめて反映する
+        self._widget_updates = {}
+        self._widget_flush_pending = False
+
+        # Comboboxのキー送り連打で状態更新が連鎖しないよう200msデバウンス
+        self._engine_after_id = None
+
         # OCR詳細設定
         self.ocr_engine = tk.StringVar(value='tesseract')
         self.text_direction = tk.StringVar(value='horizontal')
         self.preprocessing_level = tk.StringVar(value='advanced')
 
+        # Tesseract検出結果のキャッシュ（_check_ocrが書き込む）
+        self._tesseract_path = None
+
+        # 設定が同じ間はプロセッサを使い回す（manga-ocrはモデル再ロードが数秒かかる）
+        self._ocr_cache = {}
+        self._extractor = None
+
         self._setup_ui()
         self._set_default_output()
-        self._check_ocr()
+        # 共有プール（_EXEC）のスレッドは非デーモンなので、閉じる前に
+        # 停止を指示しないとキャプチャワーカーが走り続ける
+        self.root.protocol('WM_DELETE_WINDOW', self._on_close)
+        # ファイルシステム探索を伴うOCRチェックはワーカースレッドで実行し、
+        # ウィンドウを即座に描画させる（結果の反映のみTkスレッドに戻す）
+        _EXEC.submit(self._check_ocr)
 
     def _setup_ui(self):
         """UIをセットアップ"""
+        # 構築中の行単位再描画を避けるため、完成するまでウィンドウを隠す
+        self.root.withdraw()
+
+        # スタイルとフォントは一度だけ解決し、ウィジェット毎の再計算を避ける
+        self._style = ttk.Style(self.root)
+        try:
+            self._style.theme_use('vista')
+        except tk.TclError:
+            pass  # Windows以外や古いTkではデフォルトテーマのまま
+        tkfont.nametofont('TkDefaultFont').configure(size=9)
+
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -131,7 +245,8 @@ class MainWindow:
         # 表示名と内部値のマッピング
         self._engine_map = {
             'Tesseract（軽量・汎用）': 'tesseract',
-            'manga-ocr（高精度・日本語特化）': 'manga_ocr'
+            'manga-ocr（高精度・日本語特化）': 'manga_ocr',
+            'PaddleOCR（実験的・日本語）': 'paddle_manga'
         }
         self._direction_map = {
             '横書き': 'horizontal',
@@ -192,43 +307,16 @@ class MainWindow:
                                            values=list(self._preproc_map.keys()), width=14, state='readonly')
         self.preproc_combo.pack(side=tk.LEFT, padx=(5, 0))
 
-        # === テキスト抽出（OCR不要） ===
-        extract_frame = ttk.LabelFrame(main_frame, text="テキスト抽出（PDF・Wordから直接抽出、高速・高精度）", padding="10")
-        extract_frame.pack(fill=tk.X, pady=(0, 10))
-
-        extract_row1 = ttk.Frame(extract_frame)
-        extract_row1.pack(fill=tk.X)
-
-        self.extract_pdf_btn = ttk.Button(extract_row1, text="PDFからテキスト抽出", command=self._extract_pdf_text)
-        self.extract_pdf_btn.pack(side=tk.LEFT)
-
-        self.extract_word_btn = ttk.Button(extract_row1, text="Wordからテキスト抽出", command=self._extract_word_text)
-        self.extract_word_btn.pack(side=tk.LEFT, padx=(10, 0))
-
-        self.extract_status = ttk.Label(extract_row1, text="")
-        self.extract_status.pack(side=tk.LEFT, padx=(10, 0))
-
-        extract_desc = ttk.Label(extract_frame, text="※ テキスト付きPDF・Word文書から直接抽出（OCRより高速・正確）", foreground="gray")
-        extract_desc.pack(anchor=tk.W, pady=(5, 0))
-
-        # === 既存PDF/画像のOCR ===
-        pdf_ocr_frame = ttk.LabelFrame(main_frame, text="OCR（スキャン画像・写真から文字認識）", padding="10")
-        pdf_ocr_frame.pack(fill=tk.X, pady=(0, 10))
-
-        pdf_ocr_row1 = ttk.Frame(pdf_ocr_frame)
-        pdf_ocr_row1.pack(fill=tk.X)
-
-        self.pdf_ocr_btn = ttk.Button(pdf_ocr_row1, text="スキャンPDFをOCR", command=self._ocr_existing_pdf)
-        self.pdf_ocr_btn.pack(side=tk.LEFT)
-
-        self.image_ocr_btn = ttk.Button(pdf_ocr_row1, text="画像をOCR", command=self._ocr_existing_images)
-        self.image_ocr_btn.pack(side=tk.LEFT, padx=(10, 0))
-
-        self.pdf_ocr_status = ttk.Label(pdf_ocr_row1, text="")
-        self.pdf_ocr_status.pack(side=tk.LEFT, padx=(10, 0))
-
-        pdf_ocr_desc = ttk.Label(pdf_ocr_frame, text="※ スキャンしたPDFや写真から文字を読み取ります（時間がかかります）", foreground="gray")
-        pdf_ocr_desc.pack(anchor=tk.W, pady=(5, 0))
+        # === テキスト抽出・既存ファイルのOCR（使われない席も多いため遅延構築） ===
+        self._advanced_container = ttk.Frame(main_frame)
+        self._advanced_container.pack(fill=tk.X, pady=(0, 10))
+        self._advanced_built = False
+        self.advanced_btn = ttk.Button(
+            self._advanced_container,
+            text="テキスト抽出・既存ファイルのOCRを表示 ▸",
+            command=self._show_advanced
+        )
+        self.advanced_btn.pack(anchor=tk.W)
 
         # === 出力設定 ===
         output_frame = ttk.LabelFrame(main_frame, text="出力設定", padding="10")
@@ -264,36 +352,95 @@ class MainWindow:
         log_frame = ttk.Frame(progress_frame)
         log_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
 
-        self.log_text = tk.Text(log_frame, height=10, state='disabled')
-        scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=scrollbar.set)
-        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # 追記専用ログにはTextのBツリーは過剰。Listboxならフラットなリストへの
+        # O(1)挿入で、画面外の行は描画もされない
+        self.log_listbox = tk.Listbox(log_frame, height=10, activestyle='none')
+        scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_listbox.yview)
+        self.log_listbox.configure(yscrollcommand=scrollbar.set)
+        self.log_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         self.root.bind('<Escape>', lambda e: self._stop_capture())
 
+        # 全ウィジェット構築後に一度だけ表示
+        self.root.deiconify()
+
+    def _show_advanced(self):
+        """テキスト抽出/既存OCRパネルを初回クリック時に構築"""
+        if self._advanced_built:
+            return
+        self._advanced_built = True
+        self.advanced_btn.pack_forget()
+        self._build_extract_ui(self._advanced_container)
+        self._build_existing_ocr_ui(self._advanced_container)
+
+    def _build_extract_ui(self, parent):
+        """テキスト抽出パネルを構築"""
+        extract_frame = ttk.LabelFrame(parent, text="テキスト抽出（PDF・Wordから直接抽出、高速・高精度）", padding="10")
+        extract_frame.pack(fill=tk.X, pady=(0, 10))
+
+        extract_row1 = ttk.Frame(extract_frame)
+        extract_row1.pack(fill=tk.X)
+
+        self.extract_pdf_btn = ttk.Button(extract_row1, text="PDFからテキスト抽出", command=self._extract_pdf_text)
+        self.extract_pdf_btn.pack(side=tk.LEFT)
+
+        self.extract_word_btn = ttk.Button(extract_row1, text="Wordからテキスト抽出", command=self._extract_word_text)
+        self.extract_word_btn.pack(side=tk.LEFT, padx=(10, 0))
+
+        self.extract_status = ttk.Label(extract_row1, text="")
+        self.extract_status.pack(side=tk.LEFT, padx=(10, 0))
+
+        extract_desc = ttk.Label(extract_frame, text="※ テキスト付きPDF・Word文書から直接抽出（OCRより高速・正確）", foreground="gray")
+        extract_desc.pack(anchor=tk.W, pady=(5, 0))
+
+    def _build_existing_ocr_ui(self, parent):
+        """既存PDF/画像のOCRパネルを構築"""
+        pdf_ocr_frame = ttk.LabelFrame(parent, text="OCR（スキャン画像・写真から文字認識）", padding="10")
+        pdf_ocr_frame.pack(fill=tk.X, pady=(0, 10))
+
+        pdf_ocr_row1 = ttk.Frame(pdf_ocr_frame)
+        pdf_ocr_row1.pack(fill=tk.X)
+
+        self.pdf_ocr_btn = ttk.Button(pdf_ocr_row1, text="スキャンPDFをOCR", command=self._ocr_existing_pdf)
+        self.pdf_ocr_btn.pack(side=tk.LEFT)
+
+        self.image_ocr_btn = ttk.Button(pdf_ocr_row1, text="画像をOCR", command=self._ocr_existing_images)
+        self.image_ocr_btn.pack(side=tk.LEFT, padx=(10, 0))
+
+        self.pdf_ocr_status = ttk.Label(pdf_ocr_row1, text="")
+        self.pdf_ocr_status.pack(side=tk.LEFT, padx=(10, 0))
+
+        pdf_ocr_desc = ttk.Label(pdf_ocr_frame, text="※ スキャンしたPDFや写真から文字を読み取ります（時間がかかります）", foreground="gray")
+        pdf_ocr_desc.pack(anchor=tk.W, pady=(5, 0))
+
     def _set_default_output(self):
-        default_path = os.path.join(os.path.expanduser('~'), 'Documents', 'KindleSnapOCR')
-        self.output_folder.set(default_path)
+        self.output_folder.set(_DEFAULT_OUT)
 
     def _check_ocr(self):
-        """OCRエンジンの状態をチェック"""
-        from .ocr_processor import find_tesseract, check_manga_ocr_available
-
-        # Tesseractチェック
+        """OCRエンジンの状態をチェック（ワーカースレッドから呼ばれる）"""
+        # Tesseractチェック。ここはインストール完了直後にも呼ばれるため、
+        # メモ化された探索結果を破棄してから改めて探す
+        find_tesseract.cache_clear()
         tesseract_path = find_tesseract()
-        if tesseract_path:
-            self.ocr_status_label.config(text="(Tesseract検出済)", foreground="green")
-            self.ocr_check.config(state='normal')
-            self.install_tesseract_btn.pack_forget()
-        else:
-            self.ocr_status_label.config(text="(Tesseract未検出)", foreground="orange")
-            self.enable_ocr.set(False)
-            self.ocr_check.config(state='disabled')
-            self.install_tesseract_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self._tesseract_path = tesseract_path
+        manga_ocr_available = check_manga_ocr_available()
+
+        def apply():
+            if tesseract_path:
+                self.ocr_status_label.config(text="(Tesseract検出済)", foreground="green")
+                self.ocr_check.config(state='normal')
+                self.install_tesseract_btn.pack_forget()
+            else:
+                self.ocr_status_label.config(text="(Tesseract未検出)", foreground="orange")
+                self.enable_ocr.set(False)
+                self.ocr_check.config(state='disabled')
+                self.install_tesseract_btn.pack(side=tk.LEFT, padx=(10, 0))
 
-        # manga-ocrチェック
-        self._update_manga_ocr_status()
+            # manga-ocrチェック
+            self._update_manga_ocr_status(manga_ocr_available)
+
+        self.root.after(0, apply)
 
     def _get_engine_value(self) -> str:
         """表示名から内部値を取得"""
@@ -307,11 +454,11 @@ class MainWindow:
         """表示名から内部値を取得"""
         return self._preproc_map.get(self._preproc_display.get(), 'advanced')
 
-    def _update_manga_ocr_status(self):
+    def _update_manga_ocr_status(self, available=None):
         """manga-ocrの状態を更新"""
-        from .ocr_processor import check_manga_ocr_available
-
-        if check_manga_ocr_available():
+        if available is None:
+            available = check_manga_ocr_available()
+        if available:
             self.engine_status_label.config(text="利用可能", foreground="green")
             self.install_manga_ocr_btn.pack_forget()
         else:
@@ -324,11 +471,18 @@ class MainWindow:
                 self.install_manga_ocr_btn.pack_forget()
 
     def _on_engine_change(self, event=None):
-        """OCRエンジン変更時の処理"""
+        """OCRエンジン変更時の処理（200msデバウンス）"""
+        # 矢印キーでの高速スクロール中はmanga-ocrの可用性プローブを走らせない
+        if self._engine_after_id is not None:
+            self.root.after_cancel(self._engine_after_id)
+        self._engine_after_id = self.root.after(200, self._do_engine_change)
+
+    def _do_engine_change(self):
+        self._engine_after_id = None
         engine = self._get_engine_value()
 
-        if engine == 'manga_ocr':
-            # manga-ocrは前処理不要、テキスト方向自動
+        if engine in ('manga_ocr', 'paddle_manga'):
+            # ニューラル系エンジンは前処理不要、テキスト方向自動
             self.preproc_combo.config(state='disabled')
             self.direction_combo.config(state='disabled')
             self._preproc_display.set('なし')
@@ -341,11 +495,12 @@ class MainWindow:
 
     def _install_tesseract(self):
         """Tesseractをインストール"""
-        from .tesseract_installer import is_tesseract_installed, download_and_install_tesseract
-
         if is_tesseract_installed():
             messagebox.showinfo("情報", "Tesseractは既にインストールされています")
-            self._check_ocr()
+            # アプリ外でインストールされた場合、パス未検出のまま
+            # キャッシュされたプロセッサが残っている可能性がある
+            self._ocr_cache.clear()
+            _EXEC.submit(self._check_ocr)
             return
 
         result = messagebox.askyesno(
@@ -364,15 +519,18 @@ class MainWindow:
 
         def do_install():
             def progress_callback(status, current, total):
-                self.root.after(0, lambda: self.ocr_status_label.config(text=f"({status})"))
+                self._queue_widget_update(self.ocr_status_label, text=f"({status})")
 
             success = download_and_install_tesseract(progress_callback)
 
             def on_complete():
                 self.install_tesseract_btn.config(state='normal', text="Tesseractをインストール")
                 if success:
+                    # インストール前に作られたプロセッサはtesseract_path=None
+                    # のままキャッシュされているため破棄する
+                    self._ocr_cache.clear()
                     messagebox.showinfo("完了", "Tesseract OCRのインストールが完了しました")
-                    self._check_ocr()
+                    _EXEC.submit(self._check_ocr)
                 else:
                     messagebox.showerror(
                         "エラー",
@@ -380,13 +538,11 @@ class MainWindow:
                         "手動でインストールしてください:\n"
                         "https://github.com/UB-Mannheim/tesseract/wiki"
                     )
-                    self._check_ocr()
+                    _EXEC.submit(self._check_ocr)
 
             self.root.after(0, on_complete)
 
-        import threading
-        thread = threading.Thread(target=do_install, daemon=True)
-        thread.start()
+        _run_detached(do_install)
 
     def _install_manga_ocr(self):
         """manga-ocrをインストール"""
@@ -408,25 +564,22 @@ class MainWindow:
         self._log("manga-ocrをインストール中... (数分かかります)")
 
         def do_install():
-            import subprocess
             try:
-                # pipでmanga-ocrをインストール
-                result = subprocess.run(
-                    [sys.executable, '-m', 'pip', 'install', 'manga-ocr'],
-                    capture_output=True,
-                    text=True,
-                    timeout=600  # 10分タイムアウト
-                )
+                # pipでmanga-ocrをインストール（10分タイムアウト）
+                returncode, output = _pip_install('manga-ocr', timeout=600)
 
                 def on_complete():
                     self.install_manga_ocr_btn.config(state='normal', text="manga-ocrをインストール")
-                    if result.returncode == 0:
+                    if returncode == 0:
+                        # インストール前のプロセッサは_manga_ocr=Noneのまま
+                        # キャッシュされているため破棄する
+                        self._ocr_cache.clear()
                         self._log("manga-ocrのインストールが完了しました")
                         messagebox.showinfo("完了", "manga-ocrのインストールが完了しました。\n\n初回実行時にモデルがダウンロードされます。")
                         self._update_manga_ocr_status()
                     else:
-                        self._log(f"インストールエラー: {result.stderr}")
-                        messagebox.showerror("エラー", f"インストールに失敗しました:\n{result.stderr[:500]}")
+                        self._log(f"インストールエラー: {output}")
+                        messagebox.showerror("エラー", f"インストールに失敗しました:\n{output[:500]}")
 
                 self.root.after(0, on_complete)
 
@@ -444,13 +597,10 @@ class MainWindow:
                     messagebox.showerror("エラー", f"インストールに失敗しました:\n{str(e)}")
                 self.root.after(0, on_error)
 
-        thread = threading.Thread(target=do_install, daemon=True)
-        thread.start()
+        _run_detached(do_install)
 
     def _extract_pdf_text(self):
         """PDFからテキストを直接抽出"""
-        from .text_extractor import TextExtractor
-
         # PDFファイル選択
         pdf_path = filedialog.askopenfilename(
             title="テキストを抽出するPDFを選択",
@@ -461,9 +611,11 @@ class MainWindow:
         if not pdf_path:
             return
 
-        # テキストが含まれているかチェック
-        extractor = TextExtractor()
-        has_text = extractor.has_text_content(pdf_path)
+        # テキストが含まれているかチェック（抽出と同じハンドルを使い回し、
+        # xrefの二重パースを避ける）
+        extractor = self._get_extractor()
+        doc = extractor.open_pdf(pdf_path)
+        has_text = extractor.has_text_content(pdf_path, doc=doc)
 
         if not has_text:
             result = messagebox.askyesno(
@@ -474,6 +626,7 @@ class MainWindow:
                 "（テキストが抽出できない場合は、OCR機能をお試しください）"
             )
             if not result:
+                doc.close()
                 return
 
         # ボタン無効化
@@ -483,10 +636,20 @@ class MainWindow:
 
         def do_extract():
             try:
-                def progress_callback(current, total, status):
-                    self.root.after(0, lambda: self.extract_status.config(text=f"{current}/{total}ページ"))
+                last_pct = [-1]
 
-                output_path = extractor.extract_to_file(pdf_path, progress_callback=progress_callback)
+                def progress_callback(current, total, status):
+                    # 1%刻みでのみ反映（2000ページ規模でもTk側の仕事は100回）
+                    pct = 100 * current // total if total else 0
+                    if pct == last_pct[0] and current != total:
+                        return
+                    last_pct[0] = pct
+                    self._queue_widget_update(self.extract_status, text=f"{current}/{total}ページ")
+
+                try:
+                    output_path = extractor.extract_to_file(pdf_path, progress_callback=progress_callback, doc=doc)
+                finally:
+                    doc.close()
 
                 def on_complete():
                     self.extract_pdf_btn.config(state='normal')
@@ -507,13 +670,10 @@ class MainWindow:
 
                 self.root.after(0, on_error)
 
-        thread = threading.Thread(target=do_extract, daemon=True)
-        thread.start()
+        _run_detached(do_extract)
 
     def _extract_word_text(self):
         """Wordファイルからテキストを直接抽出"""
-        from .text_extractor import TextExtractor, check_docx_available
-
         if not check_docx_available():
             result = messagebox.askyesno(
                 "python-docxが必要",
@@ -553,10 +713,10 @@ class MainWindow:
 
         def do_extract():
             try:
-                extractor = TextExtractor()
+                extractor = self._get_extractor()
 
                 def progress_callback(current, total, status):
-                    self.root.after(0, lambda: self.extract_status.config(text=status))
+                    self._queue_widget_update(self.extract_status, text=status)
 
                 output_path = extractor.extract_to_file(word_path, progress_callback=progress_callback)
 
@@ -579,8 +739,7 @@ class MainWindow:
 
                 self.root.after(0, on_error)
 
-        thread = threading.Thread(target=do_extract, daemon=True)
-        thread.start()
+        _run_detached(do_extract)
 
     def _install_python_docx(self):
         """python-docxをインストール"""
@@ -589,25 +748,19 @@ class MainWindow:
         self._log("python-docxをインストール中...")
 
         def do_install():
-            import subprocess
             try:
-                result = subprocess.run(
-                    [sys.executable, '-m', 'pip', 'install', 'python-docx'],
-                    capture_output=True,
-                    text=True,
-                    timeout=120
-                )
+                returncode, output = _pip_install('python-docx', timeout=120)
 
                 def on_complete():
                     self.extract_word_btn.config(state='normal')
-                    if result.returncode == 0:
+                    if returncode == 0:
                         self.extract_status.config(text="インストール完了", foreground="green")
                         self._log("python-docxのインストールが完了しました")
                         messagebox.showinfo("完了", "python-docxのインストールが完了しました。\n\nもう一度「Wordからテキスト抽出」をクリックしてください。")
                     else:
                         self.extract_status.config(text="エラー", foreground="red")
-                        self._log(f"インストールエラー: {result.stderr}")
-                        messagebox.showerror("エラー", f"インストールに失敗しました:\n{result.stderr[:300]}")
+                        self._log(f"インストールエラー: {output}")
+                        messagebox.showerror("エラー", f"インストールに失敗しました:\n{output[:300]}")
 
                 self.root.after(0, on_complete)
 
@@ -620,15 +773,16 @@ class MainWindow:
 
                 self.root.after(0, on_error)
 
-        thread = threading.Thread(target=do_install, daemon=True)
-        thread.start()
+        _run_detached(do_install)
 
     def _create_ocr_processor(self):
         """OCRプロセッサを作成"""
-        from .ocr_processor import OCRProcessor, OCREngine, TextDirection, PreprocessingLevel
-
         engine = self._get_engine_value()
-        ocr_engine = OCREngine.MANGA_OCR if engine == 'manga_ocr' else OCREngine.TESSERACT
+        engine_enum_map = {
+            'manga_ocr': OCREngine.MANGA_OCR,
+            'paddle_manga': OCREngine.PADDLE_MANGA,
+        }
+        ocr_engine = engine_enum_map.get(engine, OCREngine.TESSERACT)
 
         direction_map = {
             'horizontal': TextDirection.HORIZONTAL,
@@ -653,21 +807,30 @@ class MainWindow:
         else:
             language = 'jpn'
 
-        return OCRProcessor(
-            language=language,
-            engine=ocr_engine,
-            text_direction=text_dir,
-            preprocessing=preproc
-        )
+        key = (ocr_engine, text_dir, preproc, language)
+        processor = self._ocr_cache.get(key)
+        if processor is None:
+            processor = OCRProcessor(
+                language=language,
+                engine=ocr_engine,
+                text_direction=text_dir,
+                preprocessing=preproc
+            )
+            self._ocr_cache[key] = processor
+        return processor
+
+    def _get_extractor(self):
+        """TextExtractorを取得（初回のみ生成）"""
+        if self._extractor is None:
+            self._extractor = TextExtractor()
+        return self._extractor
 
     def _ocr_existing_pdf(self):
         """既存PDFにOCR処理を実行"""
-        from .ocr_processor import find_tesseract, check_manga_ocr_available
-
         engine = self._get_engine_value()
 
-        # エンジンの可用性チェック
-        if engine == 'tesseract' and not find_tesseract():
+        # エンジンの可用性チェック（起動時に探索済みのキャッシュを参照）
+        if engine == 'tesseract' and not self._tesseract_path:
             messagebox.showerror("エラー", "Tesseract OCRがインストールされていません。\n先にTesseractをインストールしてください。")
             return
 
@@ -675,6 +838,10 @@ class MainWindow:
             messagebox.showerror("エラー", "manga-ocrがインストールされていません。\n先にmanga-ocrをインストールしてください。")
             return
 
+        if engine == 'paddle_manga' and not check_paddleocr_available():
+            messagebox.showerror("エラー", "PaddleOCRがインストールされていません。\npip install paddleocr を実行してください。")
+            return
+
         # PDFファイル選択
         pdf_path = filedialog.askopenfilename(
             title="OCR処理するPDFを選択",
@@ -686,7 +853,8 @@ class MainWindow:
             return
 
         # 確認
-        engine_name = "manga-ocr（高精度）" if engine == 'manga_ocr' else "Tesseract"
+        engine_names = {'manga_ocr': "manga-ocr（高精度）", 'paddle_manga': "PaddleOCR（実験的）"}
+        engine_name = engine_names.get(engine, "Tesseract")
         direction_name = self._direction_display.get()
         result = messagebox.askyesno(
             "確認",
@@ -709,8 +877,14 @@ class MainWindow:
             try:
                 ocr = self._create_ocr_processor()
 
+                last_pct = [-1]
+
                 def progress_callback(current, total, status):
-                    self.root.after(0, lambda: self.pdf_ocr_status.config(text=f"{current}/{total}ページ"))
+                    pct = 100 * current // total if total else 0
+                    if pct == last_pct[0] and current != total:
+                        return
+                    last_pct[0] = pct
+                    self._queue_widget_update(self.pdf_ocr_status, text=f"{current}/{total}ページ")
 
                 output_path = ocr.process_pdf_to_file(pdf_path, progress_callback=progress_callback)
 
@@ -733,17 +907,14 @@ class MainWindow:
 
                 self.root.after(0, on_error)
 
-        thread = threading.Thread(target=do_ocr, daemon=True)
-        thread.start()
+        _run_detached(do_ocr)
 
     def _ocr_existing_images(self):
         """既存の画像にOCR処理を実行"""
-        from .ocr_processor import find_tesseract, check_manga_ocr_available
-
         engine = self._get_engine_value()
 
-        # エンジンの可用性チェック
-        if engine == 'tesseract' and not find_tesseract():
+        # エンジンの可用性チェック（起動時に探索済みのキャッシュを参照）
+        if engine == 'tesseract' and not self._tesseract_path:
             messagebox.showerror("エラー", "Tesseract OCRがインストールされていません。\n先にTesseractをインストールしてください。")
             return
 
@@ -751,6 +922,10 @@ class MainWindow:
             messagebox.showerror("エラー", "manga-ocrがインストールされていません。\n先にmanga-ocrをインストールしてください。")
             return
 
+        if engine == 'paddle_manga' and not check_paddleocr_available():
+            messagebox.showerror("エラー", "PaddleOCRがインストールされていません。\npip install paddleocr を実行してください。")
+            return
+
         # 画像ファイル選択（複数選択可能）
         image_paths = filedialog.askopenfilenames(
             title="OCR処理する画像を選択（複数選択可）",
@@ -767,7 +942,8 @@ class MainWindow:
             return
 
         # 確認
-        engine_name = "manga-ocr（高精度）" if engine == 'manga_ocr' else "Tesseract"
+        engine_names = {'manga_ocr': "manga-ocr（高精度）", 'paddle_manga': "PaddleOCR（実験的）"}
+        engine_name = engine_names.get(engine, "Tesseract")
         direction_name = self._direction_display.get()
         result = messagebox.askyesno(
             "確認",
@@ -790,10 +966,16 @@ class MainWindow:
             try:
                 ocr = self._create_ocr_processor()
 
+                last_pct = [-1]
+
                 def progress_callback(current, total, status):
-                    self.root.after(0, lambda: self.pdf_ocr_status.config(text=f"{current}/{total}枚"))
+                    pct = 100 * current // total if total else 0
+                    if pct == last_pct[0] and current != total:
+                        return
+                    last_pct[0] = pct
+                    self._queue_widget_update(self.pdf_ocr_status, text=f"{current}/{total}枚")
 
-                results = ocr.process_images(list(image_paths), progress_callback=progress_callback)
+                results = ocr.batch_process_images(list(image_paths), progress_callback=progress_callback)
 
                 # 出力ファイルパスを決定
                 first_image = image_paths[0]
@@ -824,8 +1006,7 @@ class MainWindow:
 
                 self.root.after(0, on_error)
 
-        thread = threading.Thread(target=do_ocr, daemon=True)
-        thread.start()
+        _run_detached(do_ocr)
 
     def _toggle_page_input(self):
         if self.stop_mode.get() == 'pages':
@@ -843,7 +1024,6 @@ class MainWindow:
             self.output_folder.set(folder)
 
     def _select_region(self):
-        from .region_selector import RegionSelectorWithPreview
         self.root.iconify()  # 最小化
         self.root.update()
 
@@ -861,12 +1041,18 @@ class MainWindow:
         else:
             self._log("キャプチャ範囲の選択がキャンセルされました")
 
+    def _append_log_lines(self, lines):
+        """ログ末尾に追記（行数上限つき・手動スクロール中は追従しない）"""
+        at_bottom = self.log_listbox.yview()[1] > 0.999
+        self.log_listbox.insert(tk.END, *lines)
+        overflow = self.log_listbox.size() - self.MAX_LOG_LINES
+        if overflow > 0:
+            self.log_listbox.delete(0, overflow - 1)
+        if at_bottom:
+            self.log_listbox.see(tk.END)
+
     def _log(self, message: str):
-        self.log_text.config(state='normal')
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
+        self._append_log_lines((f"[{self._format_log_time(time.time())}] {message}",))
 
     def _update_status(self, message: str):
         self.status_label.config(text=message)
@@ -911,127 +1097,146 @@ class MainWindow:
             return
 
         self.is_capturing = True
-        self.stop_flag = False
+        self._stop_event.clear()
         self.start_button.config(state='disabled')
         self.stop_button.config(state='normal')
         self.progress_bar.pack(fill=tk.X, pady=(0, 10), before=self.status_label)
         self.progress_bar.start()
+        self._pump_id = self.root.after(50, self._drain_updates)
 
-        thread = threading.Thread(target=self._capture_thread, daemon=True)
-        thread.start()
+        self._capture_future = _EXEC.submit(self._capture_thread)
 
     def _stop_capture(self):
         if self.is_capturing:
-            self.stop_flag = True
+            self._stop_event.set()
             self._log("中断要求を送信しました...")
 
     def _capture_thread(self):
-        import time
-        from .capture import ScreenCapture
-        from .pdf_generator import PDFGenerator
-        from .privacy_overlay import PrivacyOverlayController
-
+        capture = None
         try:
-            for i in range(3, 0, -1):
-                if self.stop_flag:
-                    self._thread_safe_log("中断されました")
-                    return
-                self._thread_safe_status(f"キャプチャ開始まで {i} 秒...")
-                time.sleep(1)
+            # Event.waitなら中断要求で即座に起きる（1秒刻みのポーリング不要）
+            self._thread_safe_status("キャプチャ開始まで3秒...")
+            if self._stop_event.wait(3.0):
+                self._thread_safe_log("中断されました")
+                return
 
-            # プライバシーモードの設定
+            # Tk変数の読み取りはTclインタプリタを経由するため、
+            # スレッド冒頭で一度だけスナップショットしてローカルに束縛する
             privacy_enabled = self.privacy_mode.get()
+            book_title = self.book_title.get().strip()
+            output_folder = self.output_folder.get()
+            page_direction = self.page_direction.get()
+            delay = float(self.delay_time.get())
+            max_duplicates = int(self.auto_detect_count.get())
+            stop_mode = self.stop_mode.get()
+            total_pages = int(self.total_pages.get()) if stop_mode == 'pages' else 0
+            enable_ocr = self.enable_ocr.get()
+
+            # プライバシーモードの設定
             if privacy_enabled:
                 self._thread_safe_log("プライバシーモードを有効化...")
                 self.privacy_controller = PrivacyOverlayController(self.capture_region, self.root)
                 self.privacy_controller.start()
                 time.sleep(0.3)
 
-            book_title = self.book_title.get().strip()
-            safe_title = "".join(c for c in book_title if c.isalnum() or c in (' ', '-', '_', '.')).strip()
-            if not safe_title:
-                safe_title = "untitled"
+            safe_title = _UNSAFE_TITLE_RE.sub('', book_title).strip() or "untitled"
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_base = os.path.join(self.output_folder.get(), f"{safe_title}_{timestamp}")
-            images_dir = os.path.join(output_base, "images")
-            os.makedirs(images_dir, exist_ok=True)
+            output_base = Path(output_folder) / f"{safe_title}_{timestamp}"
+            images_dir = output_base / "images"
+            images_dir.mkdir(parents=True, exist_ok=True)
 
             self._thread_safe_log("キャプチャを開始します...")
             self._thread_safe_status("キャプチャ中...")
 
             capture = ScreenCapture(
                 region=self.capture_region,
-                page_direction=self.page_direction.get(),
-                delay=float(self.delay_time.get()),
-                max_duplicates=int(self.auto_detect_count.get())
+                page_direction=page_direction,
+                delay=delay,
+                max_duplicates=max_duplicates
             )
 
+            # ポンプ側は最新値しか反映しないので、ワーカー側も50ms単位に
+            # 間引いてf-string整形ごと省く（最終ページだけは必ず通す）
+            last_push = [0.0]
+
+            def _should_push(current, total):
+                now = time.monotonic()
+                if now - last_push[0] < 0.05 and current != total:
+                    return False
+                last_push[0] = now
+                return True
+
             def progress_cb(current, status):
-                self._thread_safe_status(f"{status}")
+                if _should_push(current, -1):
+                    self._thread_safe_status(f"{status}")
+
+            def pages_progress(current, total):
+                if _should_push(current, total):
+                    self._pbar_pct[0] = 100 * current / total
+                    self._thread_safe_status(f"{current}/{total}ページ")
 
             def check_stop():
-                return self.stop_flag
+                return self._stop_event.is_set()
 
             def on_end_detected():
                 # 音を鳴らして通知
-                import winsound
-                winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
+                if winsound is not None:
+                    winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
                 self._thread_safe_log("*** 最終ページを検出しました。ESCで停止してください ***")
 
-            stop_mode = self.stop_mode.get()
-
-            # プライバシーモード用コールバック（高速版・画面外移動方式）
-            def on_before_capture():
-                if self.privacy_controller:
-                    self.privacy_controller.hide_for_capture()
+            # OCRする場合は画像をメモリにも保持してPNG再デコードを省く。
+            # ただしTesseractは一括パス（process_and_build_pdf）がファイル
+            # 経路でPDFとOCRを同時生成するため、メモリ保持は1枚ずつ
+            # 推論する神経網系エンジンのみに限る
+            keep_in_memory = (enable_ocr and
+                              self._get_engine_value() in ('manga_ocr', 'paddle_manga'))
 
-            def on_after_capture():
-                if self.privacy_controller:
-                    self.privacy_controller.show_after_capture()
+            # プライバシーモード用コールバック（高速版・アルファ直接制御方式）。
+            # コントローラーはローカルに束縛し、ページ毎のself属性チェーン探索と
+            # 途中でNoneに差し替えられる競合の両方を避ける
+            privacy = self.privacy_controller
+            on_before_capture = privacy.hide_for_capture if privacy else None
+            on_after_capture = privacy.show_after_capture if privacy else None
 
             if stop_mode == 'pages':
-                total = int(self.total_pages.get())
                 self.captured_files = capture.capture_all_pages(
-                    total_pages=total,
-                    output_dir=images_dir,
-                    progress_callback=lambda c, t: progress_cb(c, f"{c}/{t}ページ"),
+                    total_pages=total_pages,
+                    output_dir=str(images_dir),
+                    progress_callback=pages_progress,
                     check_stop=check_stop,
-                    on_before_capture=on_before_capture if privacy_enabled else None,
-                    on_after_capture=on_after_capture if privacy_enabled else None
+                    on_before_capture=on_before_capture,
+                    on_after_capture=on_after_capture,
+                    keep_in_memory=keep_in_memory
                 )
             elif stop_mode == 'manual':
                 self.captured_files = capture.capture_until_end(
-                    output_dir=images_dir,
+                    output_dir=str(images_dir),
                     progress_callback=progress_cb,
                     check_stop=check_stop,
                     manual_mode=True,
                     on_end_detected=on_end_detected,
-                    on_before_capture=on_before_capture if privacy_enabled else None,
-                    on_after_capture=on_after_capture if privacy_enabled else None
+                    on_before_capture=on_before_capture,
+                    on_after_capture=on_after_capture,
+                    keep_in_memory=keep_in_memory
                 )
             else:  # auto
                 self.captured_files = capture.capture_until_end(
-                    output_dir=images_dir,
+                    output_dir=str(images_dir),
                     progress_callback=progress_cb,
                     check_stop=check_stop,
                     manual_mode=False,
-                    on_before_capture=on_before_capture if privacy_enabled else None,
-                    on_after_capture=on_after_capture if privacy_enabled else None
+                    on_before_capture=on_before_capture,
+                    on_after_capture=on_after_capture,
+                    keep_in_memory=keep_in_memory
                 )
 
             # プライバシーモードのオーバーレイを削除（PDF生成前）
             if self.privacy_controller:
-                cleanup_done = threading.Event()
-                def _cleanup():
-                    if self.privacy_controller:
-                        self.privacy_controller.stop()
-                        self.privacy_controller = None
-                    cleanup_done.set()
-                self.root.after(0, _cleanup)
-                cleanup_done.wait(timeout=2)
+                self.privacy_controller.destroy_now()
+                self.privacy_controller = None
 
-            if self.stop_flag:
+            if self._stop_event.is_set():
                 self._thread_safe_log(f"中断しました（{len(self.captured_files)}ページまでキャプチャ済み）")
             else:
                 self._thread_safe_log(f"キャプチャ完了: {len(self.captured_files)}ページ")
@@ -1045,28 +1250,68 @@ class MainWindow:
             self._thread_safe_log("PDFを生成しています...")
 
             pdf_generator = PDFGenerator()
-            pdf_path = os.path.join(output_base, f"{safe_title}.pdf")
+            pdf_path = output_base / f"{safe_title}.pdf"
 
             def pdf_progress(current, total):
-                self._thread_safe_status(f"PDF生成中: {current}/{total}")
-
-            pdf_generator.images_to_pdf_direct(self.captured_files, pdf_path, progress_callback=pdf_progress)
-            self._thread_safe_log(f"PDF生成完了: {pdf_path}")
-
-            # OCR処理（有効かつ利用可能な場合のみ）
-            if self.enable_ocr.get():
-                ocr = self._create_ocr_processor()
-
+                if _should_push(current, total):
+                    self._pbar_pct[0] = 100 * current / total
+                    self._thread_safe_status(f"PDF生成中: {current}/{total}")
+
+            ocr = self._create_ocr_processor() if enable_ocr else None
+
+            # Tesseract有効時は画像のデコードと認識を1回で済ませ、
+            # PDFとOCRテキストを同時に生成する（Tesseract以外や
+            # 失敗時はFalseが返り、従来の個別生成にフォールバック）。
+            # メモリ保持モードは下のprocess_pil_images経路の方が速い
+            fused = False
+            if (ocr is not None and ocr.is_available()
+                    and not capture.captured_images):
+                fused_text_path = output_base / f"{safe_title}_ocr.txt"
+
+                def fused_progress(current, total, status):
+                    if _should_push(current, total):
+                        self._pbar_pct[0] = 100 * current / total
+                        self._thread_safe_status(status)
+
+                self._thread_safe_status("PDF生成+OCR処理中...")
+                fused = ocr.process_and_build_pdf(
+                    self.captured_files, str(pdf_path), str(fused_text_path),
+                    progress_callback=fused_progress)
+                if fused:
+                    self._thread_safe_log(f"PDF生成完了: {pdf_path}")
+                    self._thread_safe_log(f"OCRテキスト保存完了: {fused_text_path}")
+
+            if not fused:
+                # メモリ保持モードならキャプチャ済み画像からサイズが分かるので
+                # PDF生成側でのファイルオープンを省く
+                image_sizes = None
+                if capture.captured_images and len(capture.captured_images) == len(self.captured_files):
+                    image_sizes = [img.size for img in capture.captured_images]
+
+                pdf_generator.images_to_pdf_direct(self.captured_files, pdf_path,
+                                                   progress_callback=pdf_progress,
+                                                   image_sizes=image_sizes)
+                self._thread_safe_log(f"PDF生成完了: {pdf_path}")
+
+            # OCR処理（有効かつ利用可能で、一括パスで済んでいない場合のみ）
+            if enable_ocr and not fused:
                 if ocr.is_available():
                     engine_name = ocr.get_engine_name()
                     self._thread_safe_status(f"{engine_name}でOCR処理中...")
                     self._thread_safe_log(f"{engine_name}でOCR処理を開始します...")
 
                     def ocr_progress(current, total, status):
-                        self._thread_safe_status(f"OCR: {current}/{total}")
-
-                    ocr_results = ocr.process_images(self.captured_files, progress_callback=ocr_progress)
-                    text_path = os.path.join(output_base, f"{safe_title}_ocr.txt")
+                        if _should_push(current, total):
+                            self._pbar_pct[0] = 100 * current / total
+                            self._thread_safe_status(f"OCR: {current}/{total}")
+
+                    if capture.captured_images:
+                        # キャプチャ済み画像をメモリ上で直接OCR
+                        ocr_results = ocr.process_pil_images(capture.captured_images, progress_callback=ocr_progress)
+                        capture.captured_images = []
+                    else:
+                        ocr_results = ocr.process_images(self.captured_files, progress_callback=ocr_progress)
+                    text_path = output_base / f"{safe_title}_ocr.txt"
                     ocr.save_ocr_results(ocr_results, text_path)
                     self._thread_safe_log(f"OCRテキスト保存完了: {text_path}")
                 else:
@@ -1089,6 +1334,10 @@ class MainWindow:
             self.root.after(0, lambda: messagebox.showerror("エラー", f"処理中にエラーが発生しました:\n{str(e)}"))
 
         finally:
+            # 保存プール・ESCフック・mssハンドルを毎回解放する
+            # （しないと実行の度にスレッドとフックが積み上がる）
+            if capture is not None:
+                capture.close()
             # プライバシーオーバーレイの確実なクリーンアップ
             if self.privacy_controller:
                 def _cleanup_overlay():
@@ -1099,18 +1348,87 @@ class MainWindow:
             self.root.after(0, self._capture_finished)
 
     def _capture_finished(self):
+        if self._pump_id is not None:
+            self.root.after_cancel(self._pump_id)
+            self._pump_id = None
+            self._drain_updates()
+            # _drain_updatesが再スケジュールした分も止める
+            self.root.after_cancel(self._pump_id)
+            self._pump_id = None
         self.is_capturing = False
-        self.stop_flag = False
+        self._capture_future = None
+        self._stop_event.clear()
         self.start_button.config(state='normal')
         self.stop_button.config(state='disabled')
         self.progress_bar.stop()
+        self._pbar_var.set(0)
+        self.progress_bar.config(mode='indeterminate')  # 次回はカウントダウンの不定表示から
         self.progress_bar.pack_forget()  # 非表示に戻す
 
     def _thread_safe_log(self, message: str):
-        self.root.after(0, lambda: self._log(message))
+        # dequeのappendはアトミックなのでロック不要。
+        # 整形はポンプ側に回し、ワーカー側はtime.time()のみ払う
+        self._log_queue.append((time.time(), message))
+
+    def _format_log_time(self, t: float) -> str:
+        # 同一秒内の連続メッセージは整形済み文字列を使い回す
+        sec = int(t)
+        if sec != self._log_time_cache[0]:
+            self._log_time_cache = (sec, time.strftime('%H:%M:%S', time.localtime(sec)))
+        return self._log_time_cache[1]
 
     def _thread_safe_status(self, message: str):
-        self.root.after(0, lambda: self._update_status(message))
+        # 最新値だけ保持し、ポンプ側で反映する
+        self._status_latest[0] = message
+
+    def _queue_widget_update(self, widget, **kwargs):
+        """ワーカーからのconfig更新をwidget毎に合流させる（最大10Hz）"""
+        self._widget_updates[widget] = kwargs
+        if not self._widget_flush_pending:
+            self._widget_flush_pending = True
+            self.root.after(100, self._flush_widget_updates)
+
+    def _flush_widget_updates(self):
+        self._widget_flush_pending = False
+        while self._widget_updates:
+            widget, kwargs = self._widget_updates.popitem()
+            widget.config(**kwargs)
+
+    def _drain_updates(self):
+        """溜まったログ/ステータスをまとめてTkに反映（50ms周期）"""
+        if self._log_queue:
+            lines = []
+            while self._log_queue:
+                t, message = self._log_queue.popleft()
+                lines.append(f"[{self._format_log_time(t)}] {message}")
+            self._append_log_lines(lines)
+
+        status = self._status_latest[0]
+        if status is not None:
+            self._status_latest[0] = None
+            self.status_label.config(text=status)
+
+        # 実進捗が届いたら不定アニメーション（常時再描画）を止めて確定表示へ
+        pct = self._pbar_pct[0]
+        if pct is not None:
+            self._pbar_pct[0] = None
+            if str(self.progress_bar.cget('mode')) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate', maximum=100,
+                                         variable=self._pbar_var)
+            self._pbar_var.set(pct)
+
+        self._pump_id = self.root.after(50, self._drain_updates)
+
+    def _on_close(self):
+        """ウィンドウクローズ時はワーカーに停止を伝えてから破棄する
+
+        concurrent.futuresの終了フックはatexitより先に実行中ワーカーの
+        完了を待つため、ここで止めないとウィンドウ消失後もヘッドレスで
+        ページ送りがmax_pagesまで続いてしまう。
+        """
+        self._stop_event.set()
+        self.root.destroy()
 
     def run(self):
         self.root.mainloop()
@@ -2,12 +2,14 @@
 PDF生成モジュール
 キャプチャした画像をPDFに変換する
 """
-import os
+import io
 from pathlib import Path
 from typing import List, Optional, Callable
-import fitz  # PyMuPDF
 from PIL import Image
 
+# fitz（PyMuPDF）は大きなC拡張でインポートに数百msかかるため、
+# 実際にPDFを作る時まで読み込みを遅らせる（各メソッド内でimport）
+
 
 class PDFGenerator:
     """画像からPDFを生成する"""
@@ -32,6 +34,8 @@ class PDFGenerator:
         Returns:
             生成されたPDFのパス
         """
+        import fitz  # PyMuPDF
+
         if not image_paths:
             raise ValueError("画像ファイルが指定されていません")
 
@@ -44,34 +48,29 @@ class PDFGenerator:
         total = len(image_paths)
 
         for idx, img_path in enumerate(image_paths):
-            # 画像を読み込み
-            img = Image.open(img_path)
-
-            # RGBAをRGBに変換（必要な場合）
-            if img.mode == 'RGBA':
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                background.paste(img, mask=img.split()[3])
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-
-            # 一時的にJPEGとして保存（PyMuPDFで読み込むため）
-            temp_path = img_path + '.temp.jpg'
-            img.save(temp_path, 'JPEG', quality=95)
-
-            # PyMuPDFで画像を読み込み
-            img_doc = fitz.open(temp_path)
-            rect = img_doc[0].rect
-
-            # PDFページを画像サイズで作成
-            page = doc.new_page(width=rect.width, height=rect.height)
+            # ヘッダだけ読んでサイズとモードを確認（ピクセルはデコードしない）
+            with Image.open(img_path) as img:
+                width, height = img.size
+                mode = img.mode
+                stream = None
+                if mode == 'RGBA':
+                    # 透過付きのみ白背景に合成してメモリ上でJPEG化
+                    # （一時ファイルを書いて読み直す必要はない）
+                    background = Image.new('RGB', img.size, (255, 255, 255))
+                    background.paste(img, mask=img.split()[3])
+                    buf = io.BytesIO()
+                    background.save(buf, 'JPEG', quality=95)
+                    stream = buf.getvalue()
 
-            # 画像を挿入
-            page.insert_image(rect, filename=temp_path)
+            page = doc.new_page(width=width, height=height)
+            rect = fitz.Rect(0, 0, width, height)
 
-            # 一時ファイルを削除
-            img_doc.close()
-            os.remove(temp_path)
+            if stream is not None:
+                page.insert_image(rect, stream=stream)
+            else:
+                # PyMuPDFが元ファイルをそのまま埋め込む。再エンコードが
+                # 走らないため高速なうえ、品質95での再圧縮劣化も無い
+                page.insert_image(rect, filename=img_path)
 
             # 進捗通知
             if progress_callback:
@@ -87,7 +86,8 @@ class PDFGenerator:
         self,
         image_paths: List[str],
         output_path: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        image_sizes: Optional[List[tuple]] = None
     ) -> str:
         """
         複数の画像を1つのPDFに変換（直接変換版）
@@ -96,22 +96,32 @@ class PDFGenerator:
             image_paths: 画像ファイルパスのリスト
             output_path: 出力PDFファイルパス
             progress_callback: 進捗コールバック (current, total)
+            image_sizes: 既知なら(width, height)のリスト。
+                渡されるとファイルを開かずに済む
 
         Returns:
             生成されたPDFのパス
         """
+        import fitz  # PyMuPDF
+
         if not image_paths:
             raise ValueError("画像ファイルが指定されていません")
 
+        if image_sizes is not None and len(image_sizes) != len(image_paths):
+            raise ValueError("画像数とサイズ数が一致しません")
+
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
         doc = fitz.open()
         total = len(image_paths)
 
         for idx, img_path in enumerate(image_paths):
-            # 画像のサイズを取得
-            with Image.open(img_path) as img:
-                width, height = img.size
+            # 画像のサイズを取得（呼び出し元が知っていればヘッダすら読まない）
+            if image_sizes is not None:
+                width, height = image_sizes[idx]
+            else:
+                with Image.open(img_path) as img:
+                    width, height = img.size
 
             # ページを作成
             page = doc.new_page(width=width, height=height)
@@ -132,8 +142,9 @@ class PDFGenerator:
 class PDFWithOCR:
     """OCR結果を埋め込んだPDFを生成"""
 
-    def __init__(self, tesseract_path: Optional[str] = None):
+    def __init__(self, tesseract_path: Optional[str] = None, language: str = 'jpn'):
         self.tesseract_path = tesseract_path
+        self.language = language
 
     def create_searchable_pdf(
         self,
@@ -157,15 +168,44 @@ class PDFWithOCR:
         if not image_paths:
             raise ValueError("画像ファイルが指定されていません")
 
+        import fitz  # PyMuPDF
+
         if len(image_paths) != len(ocr_results):
             raise ValueError("画像数とOCR結果数が一致しません")
 
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
+        # Tesseractが使えるならhOCRレイヤー方式を使う。語単位の座標付きで
+        # 不可視テキストが載るため、検索ヒットが画像上の正しい位置に出る
+        # （旧来の「全文を1点に1ptで置く」方式は位置情報が無かった）
+        pytesseract = None
+        if self.tesseract_path:
+            try:
+                import pytesseract as _pt
+                _pt.pytesseract.tesseract_cmd = self.tesseract_path
+                pytesseract = _pt
+            except ImportError:
+                pass
+
         doc = fitz.open()
         total = len(image_paths)
 
         for idx, (img_path, ocr_text) in enumerate(zip(image_paths, ocr_results)):
+            if pytesseract is not None:
+                # Tesseract自身に画像埋め込み＋位置付き不可視テキストの
+                # 1ページPDFを生成させ、そのまま継ぎ足す
+                try:
+                    pdf_bytes = pytesseract.image_to_pdf_or_hocr(
+                        img_path, extension='pdf', lang=self.language)
+                    page_doc = fitz.open('pdf', pdf_bytes)
+                    doc.insert_pdf(page_doc)
+                    page_doc.close()
+                    if progress_callback:
+                        progress_callback(idx + 1, total)
+                    continue
+                except Exception:
+                    pass  # 失敗したページのみ従来方式で埋め込む
+
             with Image.open(img_path) as img:
                 width, height = img.size
 
@@ -7,7 +7,6 @@ import tkinter as tk
 import threading
 import ctypes
 from ctypes import wintypes
-import time
 
 
 # Windows API定数
@@ -19,11 +18,32 @@ WS_EX_TOPMOST = 0x8
 LWA_ALPHA = 0x2
 
 # Windows API関数
+# argtypes/restypeを宣言しておくとctypesが呼び出し毎に行う既定の
+# 整数変換・型推測を省け、属性アクセスの再解決も起きない
 user32 = ctypes.windll.user32
-SetWindowLongW = user32.SetWindowLongW
+
+GetParent = user32.GetParent
+GetParent.argtypes = [wintypes.HWND]
+GetParent.restype = wintypes.HWND
+
 GetWindowLongW = user32.GetWindowLongW
+GetWindowLongW.argtypes = [wintypes.HWND, ctypes.c_int]
+GetWindowLongW.restype = wintypes.LONG
+
+SetWindowLongW = user32.SetWindowLongW
+SetWindowLongW.argtypes = [wintypes.HWND, ctypes.c_int, wintypes.LONG]
+SetWindowLongW.restype = wintypes.LONG
+
 SetLayeredWindowAttributes = user32.SetLayeredWindowAttributes
+SetLayeredWindowAttributes.argtypes = [wintypes.HWND, wintypes.COLORREF,
+                                       wintypes.BYTE, wintypes.DWORD]
+SetLayeredWindowAttributes.restype = wintypes.BOOL
+
 SetWindowPos = user32.SetWindowPos
+SetWindowPos.argtypes = [wintypes.HWND, wintypes.HWND,
+                         ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                         wintypes.UINT]
+SetWindowPos.restype = wintypes.BOOL
 
 # SetWindowPos flags
 HWND_TOPMOST = -1
@@ -31,6 +51,7 @@ SWP_NOMOVE = 0x0002
 SWP_NOSIZE = 0x0001
 SWP_SHOWWINDOW = 0x0040
 SWP_NOACTIVATE = 0x0010
+SWP_HIDEWINDOW = 0x0080
 
 
 class FastPrivacyOverlay:
@@ -48,9 +69,6 @@ class FastPrivacyOverlay:
         self.hwnd = None
         self.is_visible = True
         self._lock = threading.Lock()
-        # 画面外の位置（非表示用）
-        self.hidden_pos = (-10000, -10000)
-        self.normal_pos = (region[0], region[1])
 
     def create(self):
         """オーバーレイウィンドウを作成"""
@@ -102,7 +120,7 @@ class FastPrivacyOverlay:
         self.overlay.update()
 
         # ウィンドウハンドルを取得
-        self.hwnd = ctypes.windll.user32.GetParent(self.overlay.winfo_id())
+        self.hwnd = GetParent(self.overlay.winfo_id())
 
         # レイヤードウィンドウに設定
         style = GetWindowLongW(self.hwnd, GWL_EXSTYLE)
@@ -125,32 +143,23 @@ class FastPrivacyOverlay:
             SetLayeredWindowAttributes(self.hwnd, 0, alpha, LWA_ALPHA)
 
     def hide_instant(self):
-        """瞬時に非表示（画面外に移動）"""
+        """瞬時に非表示（SetWindowPosの1呼び出しのみ）"""
+        # 旧実装の「画面外(-10000,-10000)へ移動」はTkのジオメトリ文字列解析と
+        # 再配置イベントを伴ううえ、マルチモニタ構成では隣の画面に一瞬
+        # 映り込むことがあった。SWP_HIDEWINDOWなら可視状態だけが切り替わる
         with self._lock:
-            if self.overlay and self.is_visible:
-                try:
-                    # 画面外に移動（最も高速な非表示方法）
-                    self.overlay.geometry(f"+{self.hidden_pos[0]}+{self.hidden_pos[1]}")
-                    self.is_visible = False
-                except tk.TclError:
-                    pass
+            if self.hwnd and self.is_visible:
+                SetWindowPos(self.hwnd, 0, 0, 0, 0, 0,
+                             SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE | SWP_HIDEWINDOW)
+                self.is_visible = False
 
     def show_instant(self):
-        """瞬時に表示（元の位置に戻す）"""
+        """瞬時に表示（最前面を確保しつつ可視化）"""
         with self._lock:
-            if self.overlay and not self.is_visible:
-                try:
-                    left, top, right, bottom = self.region
-                    width = right - left
-                    height = bottom - top
-                    self.overlay.geometry(f"{width}x{height}+{left}+{top}")
-                    # 最前面を確保
-                    if self.hwnd:
-                        SetWindowPos(self.hwnd, HWND_TOPMOST, 0, 0, 0, 0,
-                                     SWP_NOMOVE | SWP_NOSIZE | SWP_SHOWWINDOW | SWP_NOACTIVATE)
-                    self.is_visible = True
-                except tk.TclError:
-                    pass
+            if self.hwnd and not self.is_visible:
+                SetWindowPos(self.hwnd, HWND_TOPMOST, 0, 0, 0, 0,
+                             SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE | SWP_SHOWWINDOW)
+                self.is_visible = True
 
     def destroy(self):
         """オーバーレイを完全に削除"""
@@ -177,50 +186,32 @@ class PrivacyOverlayController:
         self.region = region
         self.root = root
         self.overlay = None
+        self._hwnd = None
         self._created = threading.Event()
-        self._action_done = threading.Event()
 
     def start(self):
         """オーバーレイを作成して表示"""
         def _create():
             self.overlay = FastPrivacyOverlay(self.region, self.root)
             self.overlay.create()
+            # ページ毎のhide/showで属性チェーンを辿らないようHWNDを束縛
+            self._hwnd = self.overlay.hwnd
             self._created.set()
 
         self.root.after(0, _create)
         self._created.wait(timeout=5)
 
     def hide_for_capture(self):
-        """キャプチャ用に瞬時に非表示"""
-        if not self.overlay:
-            return
-
-        self._action_done.clear()
-
-        def _hide():
-            if self.overlay:
-                self.overlay.hide_instant()
-            self._action_done.set()
-
-        self.root.after(0, _hide)
-        self._action_done.wait(timeout=1)
-        # 非表示が反映されるまでの最小待機
-        time.sleep(0.01)
+        """キャプチャ用に瞬時に非表示（ワーカースレッドから直接呼べる）"""
+        # user32直呼び1回のみ。Tcl/Tkのコマンドディスパッチも
+        # after(0)+Event待ち+スリープの往復（ページ毎に20ms以上）も通らない
+        if self._hwnd:
+            SetLayeredWindowAttributes(self._hwnd, 0, 0, LWA_ALPHA)
 
     def show_after_capture(self):
         """キャプチャ後に瞬時に表示"""
-        if not self.overlay:
-            return
-
-        self._action_done.clear()
-
-        def _show():
-            if self.overlay:
-                self.overlay.show_instant()
-            self._action_done.set()
-
-        self.root.after(0, _show)
-        self._action_done.wait(timeout=1)
+        if self._hwnd:
+            SetLayeredWindowAttributes(self._hwnd, 0, 250, LWA_ALPHA)
 
     def stop(self):
         """オーバーレイを削除"""
@@ -231,6 +222,21 @@ class PrivacyOverlayController:
 
         self.root.after(0, _destroy)
 
+    def destroy_now(self):
+        """ワーカースレッドから直接オーバーレイを破棄（イベント往復なし）"""
+        overlay = self.overlay
+        self.overlay = None
+        self._hwnd = None
+        if overlay and overlay.overlay is not None:
+            try:
+                # tk.callはGILを握ったスレッドから安全に発行できるため
+                # after(0)+Event.wait(2秒上限)のバリアを通す必要がない
+                self.root.tk.call('destroy', overlay.overlay._w)
+            except tk.TclError:
+                pass
+            overlay.overlay = None
+            overlay.hwnd = None
+
 
 # 後方互換性のためのエイリアス
 PrivacyOverlay = FastPrivacyOverlay
@@ -5,7 +5,9 @@
 """
 import tkinter as tk
 import ctypes
-from PIL import ImageGrab, ImageTk, Image
+import numpy as np
+import mss
+from PIL import ImageTk, Image
 
 try:
     ctypes.windll.shcore.SetProcessDpiAwareness(2)
@@ -22,20 +24,29 @@ class RegionSelectorWithPreview:
         self.start_y = 0
         self.rect = None
         self.selected_region = None
-        self.screenshot = None  # 事前に撮影したスクリーンショット
+        self._ss_np = None  # 事前に撮影したスクリーンショット（ndarray）
         self.preview_size = 200  # プレビューウィンドウのサイズ
         self.zoom_factor = 3    # 拡大率
         self.preview_label = None
         self.crosshair_h = None
         self.crosshair_v = None
+        # プレビュー描画はマウスイベント毎ではなく16ms（約60Hz）に間引く
+        self._pending_xy = None
+        self._pending_after = None
+        self._last_xy = (-1, -1)
 
     def select_region(self):
         """
         オーバーレイを表示してユーザーに範囲選択させる
         Returns: (left, top, right, bottom) or None if cancelled
         """
-        # オーバーレイ表示前にスクリーンショットを撮る
-        self.screenshot = ImageGrab.grab()
+        # オーバーレイ表示前にスクリーンショットを撮る。mssはBitBlt直叩きで
+        # ImageGrabのPILオブジェクト構築を経ず、生バッファをそのまま
+        # ndarray化できる（monitors[1]=プライマリ。ImageGrabの既定と同じ）
+        with mss.mss() as sct:
+            shot = sct.grab(sct.monitors[1])
+        self._ss_np = np.frombuffer(shot.rgb, dtype=np.uint8).reshape(
+            shot.height, shot.width, 3)
 
         # 親がある場合はToplevel、ない場合はTk
         if self.parent:
@@ -90,6 +101,13 @@ class RegionSelectorWithPreview:
         )
         self.preview_label.pack()
 
+        # PhotoImageは毎フレーム作り直すと生成とテクスチャ登録が都度走る。
+        # 1枚だけ作ってlabelに束ね、以後はpaste()で中身だけ差し替える
+        self._preview_buf = Image.new(
+            'RGB', (self.preview_size, self.preview_size), '#222222')
+        self.preview_image = ImageTk.PhotoImage(self._preview_buf)
+        self.preview_label.configure(image=self.preview_image)
+
         # 座標表示ラベル
         self.coord_label = tk.Label(
             preview_frame,
@@ -119,8 +137,13 @@ class RegionSelectorWithPreview:
 
     def _update_preview(self, x, y):
         """マウス位置周辺の拡大プレビューを更新"""
-        if not self.screenshot or not self.preview_label:
+        if self._ss_np is None or not self.preview_label:
+            return
+
+        # 位置が変わっていなければ再描画もラベル更新も不要
+        if (x, y) == self._last_xy:
             return
+        self._last_xy = (x, y)
 
         try:
             # 拡大する領域のサイズ（プレビューサイズ / 拡大率）
@@ -130,31 +153,27 @@ class RegionSelectorWithPreview:
             half = capture_size // 2
             left = max(0, x - half)
             top = max(0, y - half)
-            right = min(self.screenshot.width, x + half)
-            bottom = min(self.screenshot.height, y + half)
+            right = min(self._ss_np.shape[1], x + half)
+            bottom = min(self._ss_np.shape[0], y + half)
 
-            # スクリーンショットから切り出し
-            cropped = self.screenshot.crop((left, top, right, bottom))
+            # スクリーンショットから切り出し（スライスはコピーしない）
+            patch = self._ss_np[top:bottom, left:right]
 
-            # 拡大（nearest neighborで鮮明に）
-            zoomed = cropped.resize(
-                (self.preview_size, self.preview_size),
-                Image.Resampling.NEAREST
-            )
+            # 最近傍拡大はインデックス参照のギャザー1回で済む
+            # （PILのresizeを経由するとPIL Imageの生成が2枚分増える）
+            yidx = np.arange(self.preview_size) * patch.shape[0] // self.preview_size
+            xidx = np.arange(self.preview_size) * patch.shape[1] // self.preview_size
+            zoomed_np = patch[yidx[:, None], xidx[None, :]]
 
-            # 中央に十字線を描画
-            from PIL import ImageDraw
-            draw = ImageDraw.Draw(zoomed)
+            # 中央の十字線は行・列への代入で直接焼き込む
+            # （ImageDrawを立ち上げて2本lineを引くより速く、依存も減る）
             center = self.preview_size // 2
-            line_color = '#ff0000'
-            # 横線
-            draw.line([(0, center), (self.preview_size, center)], fill=line_color, width=1)
-            # 縦線
-            draw.line([(center, 0), (center, self.preview_size)], fill=line_color, width=1)
+            zoomed_np[center, :] = (255, 0, 0)
+            zoomed_np[:, center] = (255, 0, 0)
+            zoomed = Image.fromarray(zoomed_np)
 
-            # tkinter用に変換
-            self.preview_image = ImageTk.PhotoImage(zoomed)
-            self.preview_label.configure(image=self.preview_image)
+            # 既存PhotoImageへのin-place転送（configure再設定は不要）
+            self.preview_image.paste(zoomed)
 
             # 座標を更新
             self.coord_label.configure(text=f"X: {x}, Y: {y}")
@@ -162,9 +181,25 @@ class RegionSelectorWithPreview:
         except Exception:
             pass
 
+    def _schedule_preview(self, x, y):
+        """最新のマウス位置だけを保持し、60Hz上限でプレビューを更新する
+
+        マウスイベントは描画より遥かに速く届くため、毎回描くと
+        切り出し・拡大・PhotoImage生成が積み重なってカーソルが重くなる。
+        """
+        self._pending_xy = (x, y)
+        if self._pending_after is None:
+            self._pending_after = self.root.after(16, self._flush_preview)
+
+    def _flush_preview(self):
+        self._pending_after = None
+        if self._pending_xy is not None:
+            x, y = self._pending_xy
+            self._update_preview(x, y)
+
     def _on_motion(self, event):
         """マウス移動時にプレビューを更新"""
-        self._update_preview(event.x, event.y)
+        self._schedule_preview(event.x, event.y)
 
     def _on_press(self, event):
         self.start_x = event.x
@@ -180,7 +215,7 @@ class RegionSelectorWithPreview:
     def _on_drag(self, event):
         if self.rect:
             self.canvas.coords(self.rect, self.start_x, self.start_y, event.x, event.y)
-        self._update_preview(event.x, event.y)
+        self._schedule_preview(event.x, event.y)
 
     def _on_release(self, event):
         left = min(self.start_x, event.x)
@@ -190,6 +225,7 @@ class RegionSelectorWithPreview:
 
         if right - left > 50 and bottom - top > 50:
             self.selected_region = (left, top, right, bottom)
+            self._release_buffers()
             self.root.destroy()
         else:
             if self.rect:
@@ -198,4 +234,18 @@ class RegionSelectorWithPreview:
 
     def _on_cancel(self, event):
         self.selected_region = None
+        self._release_buffers()
         self.root.destroy()
+
+    def _release_buffers(self):
+        """全画面スクリーンショットとプレビュー用バッファを手放す
+
+        選択終了後もインスタンスが親側で保持され続けることがあり、
+        フルHDで約6MBのndarrayとTk側のテクスチャを掴んだままになる。
+        _update_preview側はNoneガードがあるため、破棄後に遅延した
+        afterコールバックが届いても安全。
+        """
+        self._ss_np = None
+        self.preview_label = None
+        self.preview_image = None
+        self._preview_buf = None
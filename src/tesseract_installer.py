@@ -2,11 +2,16 @@
 Tesseract OCR 自動インストーラー
 UB Mannheim版Tesseractをダウンロードしてインストール
 """
+import functools
 import os
 import sys
+import threading
+import urllib.error
 import urllib.request
 import subprocess
+import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Callable
 
@@ -23,18 +28,12 @@ LANG_DATA_URLS = {
 
 def is_tesseract_installed() -> bool:
     """Tesseractがインストールされているかチェック"""
-    possible_paths = [
-        r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-        r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-        os.path.expanduser(r'~\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'),
-    ]
-
-    for path in possible_paths:
-        if os.path.exists(path):
-            return True
-    return False
+    return get_tesseract_path() is not None
 
 
+# 候補パスのstatは起動時・インストール確認時に繰り返し呼ばれるため
+# メモ化する。インストール直後はcache_clear()で無効化すること
+@functools.lru_cache(maxsize=1)
 def get_tesseract_path() -> Optional[str]:
     """Tesseractのパスを取得"""
     possible_paths = [
@@ -49,6 +48,7 @@ def get_tesseract_path() -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def get_tessdata_path() -> Optional[str]:
     """tessdataフォルダのパスを取得"""
     tesseract_path = get_tesseract_path()
@@ -94,10 +94,32 @@ def download_language(
     if os.path.exists(dest_path):
         return True
 
+    # 完走するまで.partに書き、完了時にrenameする。中断しても
+    # 次回はRangeヘッダで途中から再開でき、部分ファイルが
+    # 完成品として誤認されることもない
+    part_path = dest_path + '.part'
+
     try:
         if progress_callback:
             progress_callback(f'Downloading {lang}...')
-        urllib.request.urlretrieve(url, dest_path)
+        existing = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        req = urllib.request.Request(url)
+        if existing:
+            req.add_header('Range', f'bytes={existing}-')
+        try:
+            resp = urllib.request.urlopen(req)
+        except urllib.error.HTTPError as e:
+            if e.code != 416 or not existing:
+                raise
+            # 416 = 既に全バイト取得済み
+            os.replace(part_path, dest_path)
+            return True
+        with resp:
+            # サーバーがRangeを無視して200を返した場合は先頭から書き直す
+            mode = 'ab' if existing and resp.status == 206 else 'wb'
+            with open(part_path, mode) as f:
+                shutil.copyfileobj(resp, f, length=1 << 20)
+        os.replace(part_path, dest_path)
         return True
     except Exception as e:
         if progress_callback:
@@ -112,18 +134,36 @@ def ensure_japanese_installed(
     if not is_tesseract_installed():
         return False
 
-    success = True
+    missing = []
     for lang in ['jpn', 'jpn_vert']:
-        if not is_language_installed(lang):
-            if progress_callback:
-                progress_callback(f'Installing {lang} language pack...')
-            if not download_language(lang, progress_callback):
-                success = False
-        else:
+        if is_language_installed(lang):
             if progress_callback:
                 progress_callback(f'{lang} already installed')
+        else:
+            missing.append(lang)
+
+    if not missing:
+        return True
+
+    # traineddataは各20MB前後あり、直列だと待ち時間が単純に2倍になる。
+    # GitHubからの取得は帯域よりレイテンシ支配なので2本並列で重ねる
+    # （download_tesseract.pyのsetup_portableと同じ方式）。
+    # コールバックはGUIスレッド外から複数スレッドが呼ぶためロックで直列化
+    cb_lock = threading.Lock()
 
-    return success
+    def locked_callback(message: str):
+        if progress_callback:
+            with cb_lock:
+                progress_callback(message)
+
+    def fetch(lang: str) -> bool:
+        locked_callback(f'Installing {lang} language pack...')
+        return download_language(lang, locked_callback)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(fetch, missing))
+
+    return all(results)
 
 
 def download_tesseract(
@@ -147,12 +187,41 @@ def download_tesseract(
         if file_size > 50_000_000:  # 50MB以上ならOK
             return installer_path
 
-    def reporthook(block_num, block_size, total_size):
-        if progress_callback and total_size > 0:
-            downloaded = block_num * block_size
-            progress_callback(downloaded, total_size)
+    # urlretrieveは8KB単位の読み書きでsyscallが嵩むため、
+    # 1MBチャンクで自前コピーする（約70MBのインストーラーが対象）。
+    # 途中で切れた前回分が残っていればRangeヘッダで続きから取得する
+    existing = os.path.getsize(installer_path) if os.path.exists(installer_path) else 0
+    req = urllib.request.Request(TESSERACT_URL)
+    if existing:
+        req.add_header('Range', f'bytes={existing}-')
 
-    urllib.request.urlretrieve(TESSERACT_URL, installer_path, reporthook)
+    try:
+        resp = urllib.request.urlopen(req)
+    except urllib.error.HTTPError as e:
+        if e.code != 416 or not existing:
+            raise
+        # 416 = 既に全バイト取得済み
+        return installer_path
+
+    with resp:
+        if existing and resp.status == 206:
+            downloaded = existing
+            total_size = existing + int(resp.headers.get('Content-Length') or 0)
+            mode = 'ab'
+        else:
+            # サーバーがRange未対応（200）なら先頭から取り直す
+            downloaded = 0
+            total_size = int(resp.headers.get('Content-Length') or 0)
+            mode = 'wb'
+        with open(installer_path, mode) as f:
+            while True:
+                chunk = resp.read(1 << 20)
+                if not chunk:
+                    break
+                f.write(chunk)
+                downloaded += len(chunk)
+                if progress_callback and total_size > 0:
+                    progress_callback(downloaded, total_size)
     return installer_path
 
 
@@ -186,13 +255,18 @@ def install_tesseract(
             timeout=300  # 5分タイムアウト
         )
 
-        # インストール完了を確認
+        # インストール完了を確認（キャッシュされた「未インストール」の
+        # 結果を見ないよう、プローブ毎に無効化してから調べる）
         import time
         for _ in range(30):  # 最大30秒待機
+            get_tesseract_path.cache_clear()
+            get_tessdata_path.cache_clear()
             if is_tesseract_installed():
                 return True
             time.sleep(1)
 
+        get_tesseract_path.cache_clear()
+        get_tessdata_path.cache_clear()
         return is_tesseract_installed()
 
     except subprocess.TimeoutExpired:
@@ -2,11 +2,25 @@
 テキスト抽出モジュール
 PDF・Wordファイルから直接テキストを抽出（OCR不要）
 """
+import io
 import os
 from pathlib import Path
 from typing import List, Optional, Callable
 
 
+def _extract_page_range(pdf_path: str, start: int, end: int):
+    """ワーカープロセス側で[start, end)ページのテキストを抽出する"""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(pdf_path)
+    try:
+        flags = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+        return start, [doc[i].get_text("text", flags=flags)
+                       for i in range(start, end)]
+    finally:
+        doc.close()
+
+
 def check_docx_available() -> bool:
     """python-docxが利用可能かチェック"""
     try:
@@ -19,8 +33,20 @@ def check_docx_available() -> bool:
 class TextExtractor:
     """PDF・Wordからテキストを直接抽出するクラス"""
 
+    # このページ数を超えるPDFはページ範囲を分割して並列抽出する
+    # （プロセス起動と各ワーカーのopenコストを償却できる規模）
+    PARALLEL_THRESHOLD = 200
+
     def __init__(self):
-        pass
+        # has_text_contentの判定結果キャッシュ。(パス, mtime)をキーに
+        # するため、PDFが差し替えられれば自然に無効化される
+        self._textiness_cache = {}
+
+    def open_pdf(self, pdf_path: str):
+        """fitz.Documentを開く（テキスト判定と抽出でハンドルを共有するため）"""
+        import fitz  # PyMuPDF
+
+        return fitz.open(pdf_path)
 
     def extract_from_pdf(
         self,
@@ -37,25 +63,72 @@ class TextExtractor:
         Returns:
             各ページのテキストのリスト
         """
+        doc = self.open_pdf(pdf_path)
+        total = len(doc)
+        if total <= self.PARALLEL_THRESHOLD:
+            return list(self.iter_pdf_text(pdf_path, progress_callback, doc=doc))
+        doc.close()
+
+        # fitz.Documentはプロセス間で共有できないため、各ワーカーが
+        # 自分でPDFを開いてページ範囲を受け持つ（openは数十msで、
+        # 数百ページ分のget_textに対して十分小さい）
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        workers = min(os.cpu_count() or 4, 4)
+        chunk = -(-total // workers)
+        results = {}
+        done = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_extract_page_range, pdf_path, start,
+                            min(start + chunk, total))
+                for start in range(0, total, chunk)
+            ]
+            for future in as_completed(futures):
+                start, texts = future.result()
+                results[start] = texts
+                done += len(texts)
+                if progress_callback:
+                    progress_callback(done, total, f"抽出中: {done}/{total}ページ")
+
+        merged = []
+        for start in sorted(results):
+            merged.extend(results[start])
+        return merged
+
+    def iter_pdf_text(
+        self,
+        pdf_path: str,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        doc=None
+    ):
+        """PDFのテキストをページ毎に逐次生成（全ページをメモリに積まない）
+
+        docに開き済みのfitz.Documentを渡すと再オープン（xref再パース）を
+        省略できる。その場合クローズは呼び出し側の責任。
+        """
         import fitz  # PyMuPDF
 
-        results = []
-        doc = fitz.open(pdf_path)
+        owns_doc = doc is None
+        if owns_doc:
+            doc = self.open_pdf(pdf_path)
         total = len(doc)
 
+        # 平文抽出に必要な最小限のフラグに絞る（既定ではリガチャ保持や
+        # 画像情報の収集などC側の付随処理が全ページ分走る）
+        flags = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
         try:
             for page_num in range(total):
                 if progress_callback:
                     progress_callback(page_num + 1, total, f"抽出中: {page_num + 1}/{total}ページ")
 
-                page = doc[page_num]
-                text = page.get_text()
-                results.append(text)
+                yield doc[page_num].get_text("text", flags=flags)
 
         finally:
-            doc.close()
-
-        return results
+            if owns_doc:
+                doc.close()
 
     def extract_from_docx(
         self,
@@ -72,35 +145,68 @@ class TextExtractor:
         Returns:
             段落ごとのテキストのリスト（1要素=1ドキュメント全体）
         """
+        if progress_callback:
+            progress_callback(1, 1, "Word文書を読み込み中...")
+
+        # .docxは実体がzip内のXMLなので、python-docxの段落・セル毎の
+        # ラッパーオブジェクト生成を経ずに直接パースする方が大部の
+        # 文書で大幅に速い。失敗時のみ従来のオブジェクトモデルに戻す
+        try:
+            return self._extract_docx_xml(docx_path)
+        except Exception:
+            pass
+
         if not check_docx_available():
             raise ImportError("python-docxがインストールされていません。\npip install python-docx を実行してください。")
 
         from docx import Document
 
-        if progress_callback:
-            progress_callback(1, 1, "Word文書を読み込み中...")
-
         doc = Document(docx_path)
 
-        # 全テキストを抽出
-        full_text = []
+        # リストに貯めてから'\n'.joinで二度なめする代わりに、
+        # StringIOへ書き足して1パスで組み立てる
+        buf = io.StringIO()
 
         # 段落を抽出
         for para in doc.paragraphs:
             if para.text.strip():
-                full_text.append(para.text)
+                buf.write(para.text)
+                buf.write('\n')
 
         # テーブル内のテキストも抽出
         for table in doc.tables:
             for row in table.rows:
                 row_text = []
                 for cell in row.cells:
-                    if cell.text.strip():
-                        row_text.append(cell.text.strip())
+                    cell_text = cell.text.strip()
+                    if cell_text:
+                        row_text.append(cell_text)
                 if row_text:
-                    full_text.append('\t'.join(row_text))
+                    buf.write('\t'.join(row_text))
+                    buf.write('\n')
+
+        return [buf.getvalue().rstrip('\n')]
 
-        return ['\n'.join(full_text)]
+    @staticmethod
+    def _extract_docx_xml(docx_path: str) -> List[str]:
+        """word/document.xmlを直接パースして段落テキストを取り出す"""
+        import zipfile
+        import xml.etree.ElementTree as ET
+
+        W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+        with zipfile.ZipFile(docx_path) as z:
+            root = ET.fromstring(z.read('word/document.xml'))
+
+        # 段落(w:p)単位でラン(w:t)を連結する。表のセル内段落も
+        # 文書順でw:pとして現れるため、表も同じループで拾える
+        paragraphs = []
+        for para in root.iter(f'{W}p'):
+            text = ''.join(t.text for t in para.iter(f'{W}t') if t.text)
+            if text.strip():
+                paragraphs.append(text)
+
+        return ['\n'.join(paragraphs)]
 
     def extract_from_doc(
         self,
@@ -134,17 +240,23 @@ class TextExtractor:
         """抽出結果をテキストファイルに保存"""
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for idx, text in enumerate(texts):
-                if idx > 0:
-                    f.write(page_separator.format(page=idx + 1))
-                f.write(text)
+        # ページ毎のwriteを繰り返さず、まとめてwritelinesで書き出す
+        # （OCR側のsave_ocr_resultsと同じ方式）
+        parts = []
+        for idx, text in enumerate(texts):
+            if idx > 0:
+                parts.append(page_separator.format(page=idx + 1))
+            parts.append(text)
+
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(parts)
 
     def extract_to_file(
         self,
         input_path: str,
         output_path: Optional[str] = None,
-        progress_callback: Optional[Callable[[int, int, str], None]] = None
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        doc=None
     ) -> str:
         """
         ファイルからテキストを抽出してファイルに保存
@@ -159,43 +271,85 @@ class TextExtractor:
         """
         ext = os.path.splitext(input_path)[1].lower()
 
+        if output_path is None:
+            base = os.path.splitext(input_path)[0]
+            output_path = f"{base}_text.txt"
+
         if ext == '.pdf':
-            texts = self.extract_from_pdf(input_path, progress_callback)
-        elif ext == '.docx':
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            separator = "\n\n--- Page {page} ---\n\n"
+
+            # ページ数の確認（開き済みハンドルがあれば読むだけ）
+            if doc is not None:
+                total = len(doc)
+            else:
+                probe = self.open_pdf(input_path)
+                total = len(probe)
+                probe.close()
+
+            # 大部のPDFは逐次ストリーミングよりページ範囲分割の
+            # プロセス並列の方が速いため、extract_from_pdf経由で
+            # まとめて抽出してから書き出す（テキストのみなので
+            # 数百ページ分を貯めてもメモリは知れている）。
+            # 各ワーカーは自分でPDFを開くためdocは使わず、渡された
+            # ハンドルのクローズは従来通り呼び出し側の責任のまま
+            if total > self.PARALLEL_THRESHOLD:
+                texts = self.extract_from_pdf(input_path, progress_callback)
+                self.save_results(texts, output_path, separator)
+                return output_path
+
+            # それ以外はページ毎に書き出し、全文を貯め込まない
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                for idx, text in enumerate(self.iter_pdf_text(input_path, progress_callback, doc=doc)):
+                    if idx > 0:
+                        f.write(separator.format(page=idx + 1))
+                    f.write(text)
+            return output_path
+
+        if ext == '.docx':
             texts = self.extract_from_docx(input_path, progress_callback)
         elif ext == '.doc':
             texts = self.extract_from_doc(input_path, progress_callback)
         else:
             raise ValueError(f"サポートされていないファイル形式: {ext}")
 
-        if output_path is None:
-            base = os.path.splitext(input_path)[0]
-            output_path = f"{base}_text.txt"
-
         self.save_results(texts, output_path)
 
         return output_path
 
-    def has_text_content(self, pdf_path: str) -> bool:
+    def has_text_content(self, pdf_path: str, doc=None) -> bool:
         """
         PDFにテキストが含まれているかチェック
 
         Args:
             pdf_path: PDFファイルパス
+            doc: 開き済みのfitz.Document（省略時はこの場で開閉する）
 
         Returns:
             テキストが含まれている場合True
         """
-        import fitz
-
-        doc = fitz.open(pdf_path)
         try:
+            cache_key = (pdf_path, os.path.getmtime(pdf_path))
+        except OSError:
+            cache_key = None
+        if cache_key is not None and cache_key in self._textiness_cache:
+            return self._textiness_cache[cache_key]
+
+        owns_doc = doc is None
+        if owns_doc:
+            doc = self.open_pdf(pdf_path)
+        try:
+            result = False
             # 最初の数ページをチェック
             for i in range(min(3, len(doc))):
                 page = doc[i]
                 text = page.get_text().strip()
                 if len(text) > 10:  # 10文字以上あればテキスト付き
-                    return True
-            return False
+                    result = True
+                    break
+            if cache_key is not None:
+                self._textiness_cache[cache_key] = result
+            return result
         finally:
-            doc.close()
+            if owns_doc:
+                doc.close()